@@ -2,17 +2,23 @@
 Flask Backend API for Brent Oil Price Analysis Dashboard
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, request
 from flask_cors import CORS
 import pandas as pd
 import numpy as np
-from datetime import datetime
-import json
+from functools import lru_cache
+import orjson
 import pickle
+import re
+import pyarrow.parquet as pq
 from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+# Derived frames (sorting, column selection) share buffers with their parent
+# until written to; nothing here mutates loaded data, so no defensive copies
+pd.options.mode.copy_on_write = True
+
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
@@ -22,25 +28,130 @@ DATA_DIR = BASE_DIR / "data"
 RESULTS_DIR = BASE_DIR / "results"
 MODELS_DIR = BASE_DIR / "models"
 
+# orjson options: naive datetimes are emitted as UTC and numpy arrays/scalars
+# are serialized natively, so payloads don't need float()/tolist() conversions.
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+
+def json_default(obj):
+    """
+    orjson fallback for types it can't serialize natively.
+    
+    Timestamps become datetime objects, so they are emitted as ISO 8601 UTC
+    like every other date; str() is only the last resort.
+    """
+    if obj is pd.NaT:
+        return None
+    if isinstance(obj, pd.Timestamp):
+        return obj.to_pydatetime()
+    return str(obj)
+
+def ojsonify(obj, status=200):
+    """Serialize obj with orjson and wrap it in a JSON response."""
+    return app.response_class(
+        orjson.dumps(obj, default=json_default, option=ORJSON_OPTIONS),
+        status=status,
+        mimetype='application/json'
+    )
+
+def to_datetimes(values):
+    """Convert datetime64 values to a list of datetimes (None for NaT)."""
+    return np.asarray(values, dtype='datetime64[us]').tolist()
+
+def frame_records(df):
+    """
+    Convert a DataFrame to a list of row dicts, with datetime columns as datetimes.
+    
+    Prices and events go through the same to_datetimes() conversion, so all
+    dates in a payload serialize in the same ISO 8601 UTC form.
+    """
+    columns = {
+        name: to_datetimes(col.to_numpy()) if pd.api.types.is_datetime64_any_dtype(col)
+        else col.tolist()
+        for name, col in df.items()
+    }
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+# UTC suffix of the API's own ISO 8601 dates, and any other trailing offset
+UTC_SUFFIX = re.compile(r'(Z|[+-]00:?00)$')
+TZ_OFFSET = re.compile(r'[+-]\d{2}:?\d{2}$')
+
+def parse_date(value):
+    """
+    Parse a date query parameter into naive-UTC datetime64[ns] (None if missing).
+    
+    ISO 8601 dates, bare or with the UTC suffix this API emits, are parsed
+    by numpy. Anything else pandas understands (e.g. 07/01/2012, 2012/07/01,
+    RFC 822, other UTC offsets) goes through pd.Timestamp and is converted
+    to naive UTC. Raises ValueError for unparseable dates.
+    """
+    if not value:
+        return None
+    
+    iso = UTC_SUFFIX.sub('', value)
+    if not TZ_OFFSET.search(iso):
+        try:
+            return np.datetime64(iso, 'ns')
+        except ValueError:
+            pass
+    
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert(None)
+    return np.datetime64(timestamp.to_datetime64(), 'ns')
+
+STREAM_CHUNK_SIZE = 1024
+
+def records_payload_chunks(records, chunk_size=STREAM_CHUNK_SIZE):
+    """Serialize a {'success', 'count', 'data'} payload as a sequence of byte chunks."""
+    yield b'{"success":true,"count":%d,"data":[' % len(records)
+    for i in range(0, len(records), chunk_size):
+        chunk = orjson.dumps(records[i:i + chunk_size], default=json_default, option=ORJSON_OPTIONS)
+        # Strip the enclosing brackets so chunks join into one array
+        yield (b',' if i else b'') + chunk[1:-1]
+    yield b']}'
+
+def ojsonify_chunks(chunks):
+    """Stream JSON byte chunks (cached tuples or a live generator) as a response."""
+    return app.response_class(chunks, mimetype='application/json')
+
 class DataManager:
     """Manages data loading and processing for the dashboard."""
     
     def __init__(self):
-        self.price_data = None
         self.events_data = None
         self.change_points = None
         self.impact_analysis = None
+        
+        # Price data is held as sorted column arrays (datetime64 dates and
+        # float64 prices) plus cached records; events keep their DataFrame.
+        self._price_records = None
+        self._price_ts = None
+        self._price_values = None
+        self._events_records = None
+        self._events_ts = None
+        self._events_by_type = None
+        self._events_by_severity = None
+        self._volatility = None
+        self._summary_stats = None
+        
         self.load_all_data()
     
     def load_all_data(self):
         """Load all required data files."""
         try:
-            # Load price data
+            # Load price data, preferring the Parquet copy written by BrentOilData.to_parquet()
+            price_parquet_path = DATA_DIR / "processed" / "brent_clean.parquet"
             price_path = DATA_DIR / "processed" / "brent_clean.csv"
-            if price_path.exists():
-                self.price_data = pd.read_csv(price_path, parse_dates=['date'])
-                self.price_data.set_index('date', inplace=True)
-                print(f"Loaded price data: {len(self.price_data)} records")
+            if price_parquet_path.exists():
+                table = pq.read_table(price_parquet_path, columns=['date', 'price'])
+                self._set_price_arrays(table.column('date').to_numpy(),
+                                       table.column('price').to_numpy())
+                print(f"Loaded price data: {len(self._price_values)} records")
+            elif price_path.exists():
+                price_df = pd.read_csv(price_path, parse_dates=['date'])
+                self._set_price_arrays(price_df['date'].to_numpy(),
+                                       price_df['price'].to_numpy())
+                print(f"Loaded price data: {len(self._price_values)} records")
             else:
                 print(f"Price data not found at {price_path}")
             
@@ -48,6 +159,11 @@ class DataManager:
             events_path = DATA_DIR / "processed" / "historical_events.csv"
             if events_path.exists():
                 self.events_data = pd.read_csv(events_path, parse_dates=['event_date'])
+                self.events_data = self.events_data.sort_values('event_date').reset_index(drop=True)
+                self._events_records = frame_records(self.events_data)
+                self._events_ts = self.events_data['event_date'].values.astype('datetime64[ns]')
+                self._events_by_type = self._group_indices(self.events_data['event_type'])
+                self._events_by_severity = self._group_indices(self.events_data['severity'])
                 print(f"Loaded events data: {len(self.events_data)} events")
             
             # Load change points
@@ -65,38 +181,86 @@ class DataManager:
                 
         except Exception as e:
             print(f"Error loading data: {e}")
+        
+        self._summary_stats = self._compute_summary_stats()
+    
+    def _set_price_arrays(self, dates, prices):
+        """Store the price series as date-sorted arrays and build the derived caches."""
+        dates = dates.astype('datetime64[ns]')
+        order = np.argsort(dates, kind='stable')
+        self._price_ts = dates[order]
+        self._price_values = prices.astype(np.float64)[order]
+        self._price_records = [
+            {'date': date, 'price': price}
+            for date, price in zip(to_datetimes(self._price_ts),
+                                   self._price_values.tolist())
+        ]
+        self._volatility = self._compute_volatility(self._price_values)
+    
+    @staticmethod
+    def _group_indices(column):
+        """Map each value of a column to the sorted row positions holding it."""
+        return {key: np.asarray(positions) for key, positions in column.groupby(column).indices.items()}
+    
+    @staticmethod
+    def _date_bounds(timestamps, start_date=None, end_date=None):
+        """Return the [lo, hi) positions of a sorted datetime64 array within a date range."""
+        lo = np.searchsorted(timestamps, start_date) if start_date is not None else 0
+        hi = (np.searchsorted(timestamps, end_date, side='right')
+              if end_date is not None else len(timestamps))
+        return lo, hi
     
     def get_price_data(self, start_date=None, end_date=None):
         """Get price data within date range."""
-        if self.price_data is None:
+        if self._price_values is None:
             return None
         
-        data = self.price_data.copy()
-        
-        if start_date:
-            data = data[data.index >= pd.to_datetime(start_date)]
-        if end_date:
-            data = data[data.index <= pd.to_datetime(end_date)]
+        lo, hi = self._date_bounds(self._price_ts, start_date, end_date)
         
-        return data.reset_index().to_dict('records')
+        return self._price_records[lo:hi]
     
     def get_events_data(self, event_type=None, severity=None, start_date=None, end_date=None):
         """Get events data with optional filters."""
         if self.events_data is None:
             return None
         
-        data = self.events_data.copy()
+        lo, hi = self._date_bounds(self._events_ts, start_date, end_date)
         
+        if (not event_type or event_type == 'all') and (not severity or severity == 'all'):
+            return self._events_records[lo:hi]
+        
+        idx = np.arange(lo, hi)
+        empty = np.empty(0, dtype=np.intp)
         if event_type and event_type != 'all':
-            data = data[data['event_type'] == event_type]
+            idx = np.intersect1d(idx, self._events_by_type.get(event_type, empty), assume_unique=True)
         if severity and severity != 'all':
-            data = data[data['severity'] == severity]
-        if start_date:
-            data = data[data['event_date'] >= pd.to_datetime(start_date)]
-        if end_date:
-            data = data[data['event_date'] <= pd.to_datetime(end_date)]
+            idx = np.intersect1d(idx, self._events_by_severity.get(severity, empty), assume_unique=True)
+        
+        return [self._events_records[i] for i in idx]
+    
+    @staticmethod
+    def _trailing_std(returns, window):
+        """Sample std of the last `window` returns (the final value of a rolling std)."""
+        if len(returns) < window:
+            return None
+        return float(returns[-window:].std(ddof=1))
+    
+    @classmethod
+    def _compute_volatility(cls, prices):
+        """Compute volatility metrics once; the price series doesn't change after load."""
+        returns = np.diff(np.log(prices))
+        annualize = np.sqrt(252)
+        daily_vol = float(returns.std(ddof=1))
+        rolling_30d = cls._trailing_std(returns, 30)
+        rolling_90d = cls._trailing_std(returns, 90)
         
-        return data.to_dict('records')
+        return {
+            'daily_volatility': daily_vol,
+            'annualized_volatility': daily_vol * annualize,
+            'rolling_30d_vol': rolling_30d * annualize if rolling_30d is not None else None,
+            'rolling_90d_vol': rolling_90d * annualize if rolling_90d is not None else None,
+            'max_drawdown': float((prices / np.maximum.accumulate(prices) - 1).min())
+        }
     
     def get_change_points(self):
         """Get detected change points."""
@@ -110,25 +274,26 @@ class DataManager:
         if self.impact_analysis is None:
             return None
         
-        return self.impact_analysis.to_dict('records')
+        return frame_records(self.impact_analysis)
     
-    def get_summary_stats(self):
-        """Get summary statistics."""
-        if self.price_data is None:
+    def _compute_summary_stats(self):
+        """Compute summary statistics once; the data doesn't change after load."""
+        if self._price_values is None:
             return None
         
+        prices = self._price_values
         stats = {
-            'total_observations': len(self.price_data),
+            'total_observations': len(prices),
             'date_range': {
-                'start': self.price_data.index.min().strftime('%Y-%m-%d'),
-                'end': self.price_data.index.max().strftime('%Y-%m-%d')
+                'start': str(np.datetime_as_string(self._price_ts[0], unit='D')),
+                'end': str(np.datetime_as_string(self._price_ts[-1], unit='D'))
             },
             'price_stats': {
-                'mean': float(self.price_data['price'].mean()),
-                'median': float(self.price_data['price'].median()),
-                'std': float(self.price_data['price'].std()),
-                'min': float(self.price_data['price'].min()),
-                'max': float(self.price_data['price'].max())
+                'mean': prices.mean(),
+                'median': np.median(prices),
+                'std': prices.std(ddof=1),
+                'min': prices.min(),
+                'max': prices.max()
             }
         }
         
@@ -139,31 +304,44 @@ class DataManager:
         
         return stats
     
+    def get_summary_stats(self):
+        """Get summary statistics."""
+        if self._summary_stats is None:
+            return None
+        
+        return self._summary_stats
+    
+    def get_volatility(self):
+        """Get precomputed volatility metrics."""
+        if self._volatility is None:
+            return None
+        
+        return self._volatility
+    
     def get_price_around_event(self, event_date, window_days=30):
         """Get price data around a specific event."""
-        if self.price_data is None:
+        if self._price_values is None:
             return None
         
-        event_date = pd.to_datetime(event_date)
-        start_date = event_date - pd.Timedelta(days=window_days)
-        end_date = event_date + pd.Timedelta(days=window_days)
+        window = np.timedelta64(window_days, 'D')
         
-        mask = (self.price_data.index >= start_date) & (self.price_data.index <= end_date)
-        event_data = self.price_data[mask].copy()
+        lo = np.searchsorted(self._price_ts, event_date - window)
+        mid = np.searchsorted(self._price_ts, event_date)
+        hi = np.searchsorted(self._price_ts, event_date + window, side='right')
         
-        # Calculate metrics
-        before_mask = event_data.index < event_date
-        after_mask = event_data.index >= event_date
+        # Calculate metrics on contiguous views either side of the event
+        before = self._price_values[lo:mid]
+        after = self._price_values[mid:hi]
         
-        if before_mask.any() and after_mask.any():
-            before_mean = event_data[before_mask]['price'].mean()
-            after_mean = event_data[after_mask]['price'].mean()
+        if before.size and after.size:
+            before_mean = before.mean()
+            after_mean = after.mean()
             percent_change = ((after_mean - before_mean) / before_mean) * 100
         else:
             before_mean = after_mean = percent_change = None
         
         return {
-            'price_data': event_data.reset_index().to_dict('records'),
+            'price_data': self._price_records[lo:hi],
             'metrics': {
                 'before_mean': float(before_mean) if before_mean else None,
                 'after_mean': float(after_mean) if after_mean else None,
@@ -174,11 +352,39 @@ class DataManager:
 # Initialize data manager
 data_manager = DataManager()
 
+# Serialized unfiltered API responses. The data is immutable for the lifetime
+# of the process, so entries never need invalidating. Filtered queries are
+# streamed chunk by chunk instead, so arbitrary query strings can't grow memory.
+@lru_cache(maxsize=1)
+def cached_price_chunks():
+    """Serialized /api/prices payload for the full history."""
+    data = data_manager.get_price_data()
+    return None if data is None else tuple(records_payload_chunks(data))
+
+@lru_cache(maxsize=1)
+def cached_events_chunks():
+    """Serialized /api/events payload for all events."""
+    data = data_manager.get_events_data()
+    return None if data is None else tuple(records_payload_chunks(data))
+
+@lru_cache(maxsize=1)
+def cached_stats_payload():
+    """Serialized /api/stats payload."""
+    stats = data_manager.get_summary_stats()
+    if stats is None:
+        return None
+    return orjson.dumps({'success': True, 'data': stats}, default=json_default, option=ORJSON_OPTIONS)
+
+# Serialize the default payloads (the dashboard's initial load) at start-up
+cached_price_chunks()
+cached_events_chunks()
+cached_stats_payload()
+
 # API Routes
 @app.route('/')
 def index():
     """Home endpoint."""
-    return jsonify({
+    return ojsonify({
         'message': 'Brent Oil Price Analysis Dashboard API',
         'version': '1.0.0',
         'endpoints': {
@@ -194,38 +400,44 @@ def index():
 @app.route('/api/prices', methods=['GET'])
 def get_prices():
     """Get historical price data with optional date range."""
-    start_date = request.args.get('start_date')
-    end_date = request.args.get('end_date')
+    try:
+        start_date = parse_date(request.args.get('start_date'))
+        end_date = parse_date(request.args.get('end_date'))
+    except ValueError as e:
+        return ojsonify({'error': str(e)}, 400)
     
-    data = data_manager.get_price_data(start_date, end_date)
+    if start_date is None and end_date is None:
+        chunks = cached_price_chunks()
+    else:
+        data = data_manager.get_price_data(start_date, end_date)
+        chunks = None if data is None else records_payload_chunks(data)
     
-    if data is None:
-        return jsonify({'error': 'Price data not available'}), 500
+    if chunks is None:
+        return ojsonify({'error': 'Price data not available'}, 500)
     
-    return jsonify({
-        'success': True,
-        'count': len(data),
-        'data': data
-    })
+    return ojsonify_chunks(chunks)
 
 @app.route('/api/events', methods=['GET'])
 def get_events():
     """Get historical events with optional filters."""
     event_type = request.args.get('type', 'all')
     severity = request.args.get('severity', 'all')
-    start_date = request.args.get('start_date')
-    end_date = request.args.get('end_date')
+    try:
+        start_date = parse_date(request.args.get('start_date'))
+        end_date = parse_date(request.args.get('end_date'))
+    except ValueError as e:
+        return ojsonify({'error': str(e)}, 400)
     
-    data = data_manager.get_events_data(event_type, severity, start_date, end_date)
+    if event_type == severity == 'all' and start_date is None and end_date is None:
+        chunks = cached_events_chunks()
+    else:
+        data = data_manager.get_events_data(event_type, severity, start_date, end_date)
+        chunks = None if data is None else records_payload_chunks(data)
     
-    if data is None:
-        return jsonify({'error': 'Events data not available'}), 500
+    if chunks is None:
+        return ojsonify({'error': 'Events data not available'}, 500)
     
-    return jsonify({
-        'success': True,
-        'count': len(data),
-        'data': data
-    })
+    return ojsonify_chunks(chunks)
 
 @app.route('/api/change-points', methods=['GET'])
 def get_change_points():
@@ -233,9 +445,9 @@ def get_change_points():
     data = data_manager.get_change_points()
     
     if data is None:
-        return jsonify({'error': 'Change points data not available'}), 500
+        return ojsonify({'error': 'Change points data not available'}, 500)
     
-    return jsonify({
+    return ojsonify({
         'success': True,
         'data': data
     })
@@ -246,9 +458,9 @@ def get_impact():
     data = data_manager.get_impact_analysis()
     
     if data is None:
-        return jsonify({'error': 'Impact analysis data not available'}), 500
+        return ojsonify({'error': 'Impact analysis data not available'}, 500)
     
-    return jsonify({
+    return ojsonify({
         'success': True,
         'count': len(data),
         'data': data
@@ -257,54 +469,41 @@ def get_impact():
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
     """Get summary statistics."""
-    stats = data_manager.get_summary_stats()
+    payload = cached_stats_payload()
     
-    if stats is None:
-        return jsonify({'error': 'Statistics not available'}), 500
+    if payload is None:
+        return ojsonify({'error': 'Statistics not available'}, 500)
     
-    return jsonify({
-        'success': True,
-        'data': stats
-    })
+    return ojsonify_chunks((payload,))
 
 @app.route('/api/event-impact/<event_date>', methods=['GET'])
 def get_event_impact(event_date):
     """Get price data around a specific event."""
     try:
         window_days = int(request.args.get('window_days', 30))
-        data = data_manager.get_price_around_event(event_date, window_days)
+        data = data_manager.get_price_around_event(parse_date(event_date), window_days)
         
         if data is None:
-            return jsonify({'error': 'Event impact analysis not available'}), 500
+            return ojsonify({'error': 'Event impact analysis not available'}, 500)
         
-        return jsonify({
+        return ojsonify({
             'success': True,
             'event_date': event_date,
             'window_days': window_days,
             'data': data
         })
     except Exception as e:
-        return jsonify({'error': str(e)}), 400
+        return ojsonify({'error': str(e)}, 400)
 
 @app.route('/api/volatility', methods=['GET'])
 def get_volatility():
-    """Calculate volatility metrics."""
-    if data_manager.price_data is None:
-        return jsonify({'error': 'Price data not available'}), 500
-    
-    # Calculate log returns
-    returns = np.log(data_manager.price_data['price']).diff().dropna()
-    
-    # Calculate volatility metrics
-    volatility = {
-        'daily_volatility': float(returns.std()),
-        'annualized_volatility': float(returns.std() * np.sqrt(252)),
-        'rolling_30d_vol': float(returns.rolling(30).std().iloc[-1] * np.sqrt(252)),
-        'rolling_90d_vol': float(returns.rolling(90).std().iloc[-1] * np.sqrt(252)),
-        'max_drawdown': float((data_manager.price_data['price'] / data_manager.price_data['price'].cummax() - 1).min())
-    }
+    """Get volatility metrics."""
+    volatility = data_manager.get_volatility()
+    
+    if volatility is None:
+        return ojsonify({'error': 'Price data not available'}, 500)
     
-    return jsonify({
+    return ojsonify({
         'success': True,
         'data': volatility
     })
@@ -0,0 +1,27 @@
+"""
+Convert the processed price CSV to Parquet for faster dashboard start-up.
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+BASE_DIR = Path(__file__).parent.parent.parent
+PROCESSED_DIR = BASE_DIR / "data" / "processed"
+
+sys.path.append(str(BASE_DIR / "src"))
+from data_processing import BrentOilData
+
+
+def convert_prices(csv_path=PROCESSED_DIR / "brent_clean.csv",
+                   parquet_path=PROCESSED_DIR / "brent_clean.parquet"):
+    """Write the cleaned price series with BrentOilData's Parquet writer."""
+    processor = BrentOilData()
+    processor.df = pd.read_csv(csv_path, parse_dates=['date'], index_col='date')
+    processor.to_parquet(parquet_path)
+    print(f"Wrote {len(processor.df)} price records to {parquet_path}")
+    return parquet_path
+
+
+if __name__ == '__main__':
+    convert_prices()
@@ -0,0 +1,18 @@
+"""
+Gunicorn configuration for the Flask backend.
+
+Usage: gunicorn app:app -c gunicorn.conf.py
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+
+# Load the app (and its DataManager) once in the master process so workers
+# share the loaded data copy-on-write instead of each re-reading the files
+preload_app = True
+
+workers = int(os.environ.get("GUNICORN_WORKERS", min(4, multiprocessing.cpu_count())))
+worker_class = "gevent"
+worker_connections = 1000
+keepalive = 5
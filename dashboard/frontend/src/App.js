@@ -132,9 +132,9 @@ function App() {
     filteredEvents.forEach(event => {
       const eventDate = new Date(event.event_date);
       const dataPoint = chartData.find(d => 
-        d.date.getDate() === eventDate.getDate() &&
-        d.date.getMonth() === eventDate.getMonth() &&
-        d.date.getFullYear() === eventDate.getFullYear()
+        d.date.getUTCDate() === eventDate.getUTCDate() &&
+        d.date.getUTCMonth() === eventDate.getUTCMonth() &&
+        d.date.getUTCFullYear() === eventDate.getUTCFullYear()
       );
       
       if (dataPoint) {
@@ -316,14 +316,14 @@ function App() {
                   <CartesianGrid strokeDasharray="3 3" />
                   <XAxis 
                     dataKey="date"
-                    tickFormatter={(date) => new Date(date).toLocaleDateString()}
+                    tickFormatter={(date) => new Date(date).toLocaleDateString(undefined, { timeZone: 'UTC' })}
                   />
                   <YAxis 
                     label={{ value: 'Price (USD)', angle: -90, position: 'insideLeft' }}
                   />
                   <Tooltip 
                     formatter={(value) => [`$${value.toFixed(2)}`, 'Price']}
-                    labelFormatter={(label) => new Date(label).toLocaleDateString()}
+                    labelFormatter={(label) => new Date(label).toLocaleDateString(undefined, { timeZone: 'UTC' })}
                   />
                   <Legend />
                   <Line 
@@ -369,7 +369,7 @@ function App() {
                     <Box display="flex" justifyContent="space-between" alignItems="flex-start">
                       <Box>
                         <Typography variant="subtitle2" fontWeight="bold">
-                          {new Date(event.event_date).toLocaleDateString()}
+                          {new Date(event.event_date).toLocaleDateString(undefined, { timeZone: 'UTC' })}
                         </Typography>
                         <Typography variant="body2" color="textSecondary">
                           {event.event_name}
@@ -516,10 +516,10 @@ function App() {
                     Detected Change Point
                   </Typography>
                   <Typography variant="body2">
-                    <strong>Date:</strong> {new Date(data.changePoints.mode_date).toLocaleDateString()}
+                    <strong>Date:</strong> {new Date(data.changePoints.mode_date).toLocaleDateString(undefined, { timeZone: 'UTC' })}
                   </Typography>
                   <Typography variant="body2">
-                    <strong>95% HDI:</strong> {new Date(data.changePoints.hdi_95_dates[0]).toLocaleDateString()} to {new Date(data.changePoints.hdi_95_dates[1]).toLocaleDateString()}
+                    <strong>95% HDI:</strong> {new Date(data.changePoints.hdi_95_dates[0]).toLocaleDateString(undefined, { timeZone: 'UTC' })} to {new Date(data.changePoints.hdi_95_dates[1]).toLocaleDateString(undefined, { timeZone: 'UTC' })}
                   </Typography>
                   <Typography variant="body2">
                     <strong>Mean Index:</strong> {data.changePoints.mean}
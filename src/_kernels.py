@@ -0,0 +1,288 @@
+"""
+Numeric kernels shared by the analysis modules, compiled with Numba where
+the work is a Python-level loop.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; the kernels then run as plain Python
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def rolling_mean_std_abs(x, window):
+    """
+    Rolling mean, rolling sample std and absolute values in a single pass.
+
+    Keeps a running sum and sum of squares over the trailing window, adding
+    the entering element and subtracting the leaving one. The sums are taken
+    about a shift that is reset to the window mean, with the sums recomputed
+    exactly, once every ``window`` steps; this avoids cancellation when the
+    variance is small next to the squared mean and stops rounding error from
+    accumulating along the series. The first ``window - 1`` rolling values
+    are NaN, matching ``pd.Series.rolling``.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        1-D float array without missing values
+    window : int
+        Rolling window size
+
+    Returns
+    -------
+    tuple of np.ndarray
+        (rolling_mean, rolling_std, abs_x), each the same length as x
+    """
+    n = x.size
+    mean = np.full(n, np.nan)
+    std = np.full(n, np.nan)
+    abs_x = np.empty(n)
+    shift = x[0] if n > 0 else 0.0
+    total = 0.0
+    total_sq = 0.0
+
+    for i in range(n):
+        v = x[i]
+        abs_x[i] = abs(v)
+        d = v - shift
+        total += d
+        total_sq += d * d
+
+        if i >= window:
+            old = x[i - window] - shift
+            total -= old
+            total_sq -= old * old
+
+        if i >= window - 1:
+            m = total / window
+            mean[i] = shift + m
+            if window > 1:
+                var = (total_sq - window * m * m) / (window - 1)
+                std[i] = np.sqrt(var) if var > 0.0 else 0.0
+
+            if (i + 1) % window == 0:
+                shift = mean[i]
+                total = 0.0
+                total_sq = 0.0
+                for j in range(i - window + 1, i + 1):
+                    d = x[j] - shift
+                    total += d
+                    total_sq += d * d
+
+    return mean, std, abs_x
+
+
+@njit(cache=True)
+def rolling_stats(x, window):
+    """
+    Rolling mean, std, min, max, median, 25% and 75% quantiles in one pass.
+
+    Keeps the current window's valid values in a sorted buffer (binary search
+    to insert the entering value and remove the leaving one), from which the
+    extremes and linearly interpolated quantiles are read directly. Mean and
+    variance are taken two-pass over the buffer, which costs the same O(window)
+    per step as the insertion and, unlike a sliding sum or sliding Welford
+    update, does not accumulate rounding error along the series. A row is NaN
+    unless its window holds ``window`` non-NaN values, matching
+    ``pd.Series.rolling(window)``.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        1-D float array, may contain NaN
+    window : int
+        Rolling window size
+
+    Returns
+    -------
+    np.ndarray
+        (len(x), 7) array with columns mean, std, min, max, median, q25, q75
+    """
+    n = x.size
+    out = np.full((n, 7), np.nan)
+    buf = np.empty(window + 1)
+    count = 0
+
+    for i in range(n):
+        v = x[i]
+        if not np.isnan(v):
+            pos = np.searchsorted(buf[:count], v)
+            for j in range(count, pos, -1):
+                buf[j] = buf[j - 1]
+            buf[pos] = v
+            count += 1
+
+        if i >= window:
+            old = x[i - window]
+            if not np.isnan(old):
+                pos = np.searchsorted(buf[:count], old)
+                for j in range(pos, count - 1):
+                    buf[j] = buf[j + 1]
+                count -= 1
+
+        if count == window:
+            mean = 0.0
+            for j in range(count):
+                mean += buf[j]
+            mean /= count
+            out[i, 0] = mean
+            if window > 1:
+                m2 = 0.0
+                for j in range(count):
+                    m2 += (buf[j] - mean) ** 2
+                out[i, 1] = np.sqrt(m2 / (window - 1))
+            out[i, 2] = buf[0]
+            out[i, 3] = buf[count - 1]
+            for col, q in ((4, 0.5), (5, 0.25), (6, 0.75)):
+                h = q * (count - 1)
+                lo = int(h)
+                hi = min(lo + 1, count - 1)
+                out[i, col] = buf[lo] + (h - lo) * (buf[hi] - buf[lo])
+
+    return out
+
+
+@njit(parallel=True, cache=True)
+def rolling_stats_parallel(x, window):
+    """
+    Same output as ``rolling_stats``, computing each window independently.
+
+    Every window is copied and sorted on its own, so rows are spread across
+    threads with ``prange``. That is O(window log window) work per row instead
+    of the sequential kernel's O(window), which pays off on multi-core
+    machines for long series.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        1-D float array, may contain NaN
+    window : int
+        Rolling window size
+
+    Returns
+    -------
+    np.ndarray
+        (len(x), 7) array with columns mean, std, min, max, median, q25, q75
+    """
+    n = x.size
+    out = np.full((n, 7), np.nan)
+
+    for i in prange(window - 1, n):
+        values = np.sort(x[i - window + 1:i + 1])
+        # NaNs sort last; any NaN leaves the row undefined
+        if np.isnan(values[window - 1]):
+            continue
+
+        mean = values.sum() / window
+        out[i, 0] = mean
+        if window > 1:
+            out[i, 1] = np.sqrt(((values - mean) ** 2).sum() / (window - 1))
+        out[i, 2] = values[0]
+        out[i, 3] = values[window - 1]
+        for col, q in ((4, 0.5), (5, 0.25), (6, 0.75)):
+            h = q * (window - 1)
+            lo = int(h)
+            hi = min(lo + 1, window - 1)
+            out[i, col] = values[lo] + (h - lo) * (values[hi] - values[lo])
+
+    return out
+
+
+@njit(cache=True)
+def ffill_inplace(x):
+    """
+    Forward-fill NaNs in a 1-D float array, in place.
+
+    Leading NaNs (before the first valid value) are left as NaN, matching
+    ``pd.Series.ffill``.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        1-D writable float array
+    """
+    last = np.nan
+    for i in range(x.size):
+        if np.isnan(x[i]):
+            x[i] = last
+        else:
+            last = x[i]
+
+
+def autocovariance_fft(x, nlags, adjusted=False):
+    """
+    Autocovariance up to ``nlags`` via a single zero-padded FFT.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        1-D float array without missing values
+    nlags : int
+        Number of lags to return
+    adjusted : bool
+        Divide lag k by n - k instead of n
+
+    Returns
+    -------
+    np.ndarray
+        Autocovariances for lags 0..nlags
+    """
+    n = x.size
+    centered = x - x.mean()
+    # Pad to a power of two >= 2n - 1 so the circular correlation doesn't wrap
+    nfft = 1 << (2 * n - 1).bit_length()
+    spectrum = np.fft.rfft(centered, nfft)
+    acov = np.fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2, nfft)[:nlags + 1]
+    divisor = n - np.arange(nlags + 1) if adjusted else n
+    return acov / divisor
+
+
+@njit(cache=True)
+def pacf_durbin_levinson(acf_vals):
+    """
+    Partial autocorrelations from autocorrelations (Durbin-Levinson recursion).
+
+    Solves the Yule-Walker equations for every order up to
+    ``len(acf_vals) - 1`` in O(nlags^2).
+
+    Parameters
+    ----------
+    acf_vals : np.ndarray
+        Autocorrelations for lags 0..nlags (acf_vals[0] == 1)
+
+    Returns
+    -------
+    np.ndarray
+        Partial autocorrelations for lags 0..nlags
+    """
+    nlags = acf_vals.size - 1
+    pacf = np.empty(nlags + 1)
+    pacf[0] = 1.0
+    phi = np.zeros(nlags + 1)
+    prev = np.zeros(nlags + 1)
+
+    for k in range(1, nlags + 1):
+        num = acf_vals[k]
+        den = 1.0
+        for j in range(1, k):
+            num -= prev[j] * acf_vals[k - j]
+            den -= prev[j] * acf_vals[j]
+        phi_kk = num / den
+
+        phi[k] = phi_kk
+        for j in range(1, k):
+            phi[j] = prev[j] - phi_kk * prev[k - j]
+        for j in range(1, k + 1):
+            prev[j] = phi[j]
+        pacf[k] = phi_kk
+
+    return pacf
@@ -3,15 +3,38 @@ Bayesian Change Point Detection for Brent oil prices using PyMC.
 """
 
 import pymc as pm
+import pytensor.tensor as pt
 import numpy as np
 import pandas as pd
 import arviz as az
-from scipy import stats
 import xarray as xr
 from typing import Dict, Tuple, Optional, List
 import warnings
 warnings.filterwarnings('ignore')
 
+
+def _window_stats(data: np.ndarray, cp_indices: np.ndarray,
+                  window_before: int, window_after: int) -> np.ndarray:
+    """
+    Mean and standard deviation of the windows either side of each change point.
+    
+    Returns
+    -------
+    np.ndarray
+        Array of shape (n_changepoints, 4) with columns
+        before_mean, before_std, after_mean, after_std
+    """
+    out = np.empty((len(cp_indices), 4))
+    n = len(data)
+    
+    for i, cp in enumerate(cp_indices):
+        before = data[max(0, cp - window_before):cp]
+        after = data[cp:min(n, cp + window_after)]
+        out[i] = before.mean(), before.std(), after.mean(), after.std()
+    
+    return out
+
+
 class BayesianChangePointModel:
     """Bayesian change point detection model for time series data."""
     
@@ -36,7 +59,8 @@ class BayesianChangePointModel:
             'tau_prior': {'distribution': 'uniform', 'lower': 0, 'upper': self.n_obs},
             'mu_prior': {'distribution': 'normal', 'mu': 0, 'sigma': 1},
             'sigma_prior': {'distribution': 'halfnormal', 'sigma': 1},
-            'sampling': {'draws': 3000, 'tune': 1000, 'chains': 4, 'target_accept': 0.99},
+            'sampling': {'draws': 3000, 'tune': 1000, 'chains': 4, 'target_accept': 0.99,
+                         'sampler': 'pymc', 'compile_mode': None},
             'convergence': {'rhat_threshold': 1.01, 'ess_threshold': 400}
         }
         
@@ -51,26 +75,25 @@ class BayesianChangePointModel:
         
     def build_single_change_point_model(self):
         with pm.Model() as model:
-            import pytensor.tensor as pt
             t = pt.arange(self.n_obs)
 
-        # Continuous change point
+            # Continuous change point
             tau = pm.Normal(
-            "tau",
-            mu=self.n_obs / 2,
-            sigma=self.n_obs / 10
+                "tau",
+                mu=self.n_obs / 2,
+                sigma=self.n_obs / 10
             )
 
-        # Smoothness of transition
+            # Smoothness of transition
             k = pm.Exponential("k", 1 / 5)
 
-        # Regime means
+            # Regime means
             mu1 = pm.Normal("mu1", mu=0, sigma=0.02)
             mu2 = pm.Normal("mu2", mu=0, sigma=0.02)
 
             sigma = pm.HalfNormal("sigma", sigma=0.05)
 
-        # Smooth transition
+            # Smooth transition
             w = pm.math.sigmoid((t - tau) / k)
             mean = mu1 * (1 - w) + mu2 * w
 
@@ -103,16 +126,14 @@ class BayesianChangePointModel:
             # Prior for standard deviation
             sigma = pm.HalfNormal("sigma", sigma=1)
             
-            # Create mean array based on change points
-            mean_array = np.zeros(self.n_obs)
-            segment_idx = 0
-            
-            for i in range(self.n_obs):
-                if segment_idx < n_changepoints and i >= changepoints[segment_idx]:
-                    segment_idx += 1
-                mean_array[i] = mus[segment_idx]
+            # Segment index of each observation: the number of change
+            # points at or before it (the last cumsum entry is n_obs itself)
+            t = pt.arange(self.n_obs)
+            segment_idx = pt.extra_ops.searchsorted(
+                changepoints[:n_changepoints], t, side='right'
+            )
             
-            mean = pm.Deterministic("mean", mean_array)
+            mean = pm.Deterministic("mean", mus[segment_idx])
             
             # Likelihood
             likelihood = pm.Normal(
@@ -134,7 +155,12 @@ class BayesianChangePointModel:
         model_type : str
             'single' or 'multiple' change point model
         **kwargs
-            Additional arguments for pm.sample()
+            Additional arguments for the sampler. ``sampler`` selects the
+            backend: 'pymc' (default), or the JAX-based 'numpyro' and
+            'blackjax' samplers, which also accept ``chain_method``
+            ('parallel' or 'vectorized'). ``compile_mode`` (e.g. 'NUMBA')
+            sets the PyTensor backend used to compile the 'pymc' sampler's
+            log-probability and gradient
             
         Returns
         -------
@@ -153,13 +179,38 @@ class BayesianChangePointModel:
         # Sampling parameters
         sampling_params = self.config['sampling'].copy()
         sampling_params.update(kwargs)
+        sampler = sampling_params.pop('sampler', 'pymc')
+        compile_mode = sampling_params.pop('compile_mode', None)
         
         print(f"Sampling with {sampling_params['chains']} chains, "
-              f"{sampling_params['draws']} draws, {sampling_params['tune']} tuning steps...")
+              f"{sampling_params['draws']} draws, {sampling_params['tune']} tuning steps "
+              f"({sampler} sampler)...")
         
         # Run sampling
         with self.model:
-            self.trace = pm.sample(**sampling_params)
+            if sampler == 'pymc':
+                if compile_mode is not None and 'step' not in sampling_params:
+                    # pm.sample() only takes compile_kwargs from pymc 5.19, so
+                    # hand the mode to NUTS through the step kwargs. Passing a
+                    # ready-made step instead would skip init_nuts, and with
+                    # it the jitter+adapt_diag chain initialization
+                    nuts_kwargs = dict(sampling_params.pop('nuts', {}))
+                    if 'target_accept' in sampling_params:
+                        nuts_kwargs['target_accept'] = sampling_params.pop('target_accept')
+                    nuts_kwargs['mode'] = compile_mode
+                    sampling_params['nuts'] = nuts_kwargs
+                self.trace = pm.sample(**sampling_params)
+            elif sampler in ('numpyro', 'blackjax'):
+                # JAX samplers JIT-compile the log-probability once and can run
+                # all chains in a single vectorized call
+                from pymc.sampling import jax as pm_jax
+                sampling_params.pop('cores', None)
+                sampling_params.setdefault('chain_method', 'vectorized')
+                sample_fn = (pm_jax.sample_numpyro_nuts if sampler == 'numpyro'
+                             else pm_jax.sample_blackjax_nuts)
+                self.trace = sample_fn(**sampling_params)
+            else:
+                raise ValueError(f"Unknown sampler: {sampler}")
         
         # Calculate summary statistics
         self.summary = az.summary(self.trace)
@@ -215,19 +266,18 @@ class BayesianChangePointModel:
         
         if 'tau' in self.trace.posterior:
             # Single change point model
-            tau_samples = self.trace.posterior['tau'].values.flatten()
+            tau_samples = self.trace.posterior['tau'].to_numpy().ravel()
+            
+            # Integer change point indices (tau is continuous), clipped to the series
+            tau_int = np.clip(tau_samples, 0, self.n_obs - 1).astype(np.int64)
             
             # Convert to dates
-            tau_dates = [self.dates[int(t)] if t < len(self.dates) else self.dates[-1] 
-                        for t in tau_samples]
+            tau_dates = self.dates.values[tau_int]
             
             # Calculate statistics
             tau_mean = int(tau_samples.mean())
             tau_median = int(np.median(tau_samples))
-
-
-            
-            tau_mode = int(stats.mode(tau_samples, keepdims=True)[0])
+            tau_mode = int(np.bincount(tau_int, minlength=self.n_obs).argmax())
             tau_hdi = az.hdi(tau_samples, hdi_prob=0.95)
             
             return {
@@ -248,11 +298,13 @@ class BayesianChangePointModel:
             }
         elif 'changepoints' in self.trace.posterior:
             # Multiple change points model
-            changepoint_samples = self.trace.posterior['changepoints'].values
+            # (chain, draw, changepoint) -> (sample, changepoint) without copying
+            changepoints = self.trace.posterior['changepoints'].to_numpy()
+            changepoint_samples = changepoints.reshape(-1, changepoints.shape[-1])
             
             results = []
-            for i in range(changepoint_samples.shape[2]):  # For each change point
-                cp_samples = changepoint_samples[:, :, i].flatten()
+            for i in range(changepoint_samples.shape[1]):  # For each change point
+                cp_samples = changepoint_samples[:, i]
                 cp_mean = int(cp_samples.mean())
                 
                 results.append({
@@ -292,52 +344,51 @@ class BayesianChangePointModel:
             # Get the most probable change point
             tau_mode = change_point_info['mode']
             
-            # Extract data around change point
-            start_idx = max(0, tau_mode - window_before)
-            end_idx = min(len(self.data), tau_mode + window_after)
-            
-            before_data = self.data[max(0, tau_mode - window_before):tau_mode]
-            after_data = self.data[tau_mode:min(len(self.data), tau_mode + window_after)]
+            before_mean, before_std, after_mean, after_std = _window_stats(
+                self.data, np.array([tau_mode]), window_before, window_after
+            )[0]
+            mean_change = after_mean - before_mean
+            n_before = min(window_before, tau_mode)
+            n_after = min(window_after, self.n_obs - tau_mode)
             
             # Calculate impact metrics
             impact = {
                 'change_point_index': tau_mode,
                 'change_point_date': change_point_info['mode_date'],
                 'before': {
-                    'mean': float(before_data.mean()),
-                    'std': float(before_data.std()),
-                    'n_obs': len(before_data)
+                    'mean': float(before_mean),
+                    'std': float(before_std),
+                    'n_obs': n_before
                 },
                 'after': {
-                    'mean': float(after_data.mean()),
-                    'std': float(after_data.std()),
-                    'n_obs': len(after_data)
+                    'mean': float(after_mean),
+                    'std': float(after_std),
+                    'n_obs': n_after
                 },
                 'impact': {
-                    'mean_change': float(after_data.mean() - before_data.mean()),
-                    'percent_change': float((after_data.mean() - before_data.mean()) / before_data.mean() * 100),
-                    'volatility_change': float(after_data.std() - before_data.std()),
-                    'effect_size': float((after_data.mean() - before_data.mean()) / before_data.std())
+                    'mean_change': float(mean_change),
+                    'percent_change': float(mean_change / before_mean * 100),
+                    'volatility_change': float(after_std - before_std),
+                    'effect_size': float(mean_change / before_std)
                 }
             }
             
             return impact
         else:
             # Handle multiple change points
+            cp_indices = np.array([int(cp_info['mean']) for cp_info in change_point_info['change_points']])
+            window_stats = _window_stats(self.data, cp_indices, window_before, window_after)
+            
             impacts = []
-            for cp_info in change_point_info['change_points']:
-                cp_idx = int(cp_info['mean'])
-                
-                before_data = self.data[max(0, cp_idx - window_before):cp_idx]
-                after_data = self.data[cp_idx:min(len(self.data), cp_idx + window_after)]
-                
+            for cp_info, cp_idx, (before_mean, _, after_mean, _) in zip(
+                    change_point_info['change_points'], cp_indices, window_stats):
                 impact = {
-                    'change_point_index': cp_idx,
+                    'change_point_index': int(cp_idx),
                     'change_point_date': cp_info['mean_date'],
-                    'before_mean': float(before_data.mean()),
-                    'after_mean': float(after_data.mean()),
-                    'mean_change': float(after_data.mean() - before_data.mean()),
-                    'percent_change': float((after_data.mean() - before_data.mean()) / before_data.mean() * 100)
+                    'before_mean': float(before_mean),
+                    'after_mean': float(after_mean),
+                    'mean_change': float(after_mean - before_mean),
+                    'percent_change': float((after_mean - before_mean) / before_mean * 100)
                 }
                 impacts.append(impact)
             
@@ -8,15 +8,29 @@ import numpy as np
 from pathlib import Path
 import logging
 
+from _kernels import ffill_inplace
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.feather as pa_feather
+except ImportError:  # pyarrow is optional; load_data falls back to the C parser
+    pa = None
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Price dtypes by precision setting. float32 keeps >6 significant digits,
+# more than the source CSV provides for prices in the $10-$150 range.
+PRICE_DTYPES = {'f32': np.float32, 'f64': np.float64}
+
 
 class BrentOilData:
     """Class to handle Brent oil price data loading and processing."""
     
-    def __init__(self, data_path: str = "data/raw/BrentOilPrices.csv"):
+    def __init__(self, data_path: str = "data/raw/BrentOilPrices.csv",
+                 use_pyarrow: bool = True, precision: str = 'f64'):
         """
         Initialize data processor.
         
@@ -24,8 +38,18 @@ class BrentOilData:
         ----------
         data_path : str
             Path to the raw CSV file
+        use_pyarrow : bool
+            Read the CSV with pyarrow's multithreaded reader when available
+        precision : str
+            'f64' to keep cleaned prices as float64, 'f32' to hold them as
+            float32 in memory. Saved files always store float64.
         """
+        if precision not in PRICE_DTYPES:
+            raise ValueError(f"Unknown precision: {precision}")
+        
         self.data_path = Path(data_path)
+        self.use_pyarrow = use_pyarrow
+        self.precision = precision
         self.df = None
         self.returns = None
         
@@ -41,18 +65,27 @@ class BrentOilData:
         logger.info(f"Loading data from {self.data_path}")
         
         try:
-            # Read CSV with date parsing
-            self.df = pd.read_csv(
-                self.data_path,
-                parse_dates=['Date'],
-                dayfirst=True  # Dates are in day-month-year format
-            )
-            
-            # Ensure proper column names
-            self.df.columns = ['date', 'price']
-            
-            # Sort by date
-            self.df = self.df.sort_values('date').reset_index(drop=True)
+            if self.use_pyarrow and pa is not None:
+                # Tokenize with Arrow, then parse the dates in one vectorized pass
+                table = pa_csv.read_csv(
+                    self.data_path,
+                    convert_options=pa_csv.ConvertOptions(
+                        column_types={'Date': pa.string(), 'Price': pa.float64()}
+                    )
+                )
+                self.df = table.to_pandas()
+                self.df.columns = ['date', 'price']
+                self.df['date'] = self._parse_dates(self.df['date'])
+            else:
+                # Read CSV with date parsing
+                self.df = pd.read_csv(
+                    self.data_path,
+                    parse_dates=['Date'],
+                    dayfirst=True  # Dates are in day-month-year format
+                )
+                
+                # Ensure proper column names
+                self.df.columns = ['date', 'price']
             
             logger.info(f"Data loaded successfully. Shape: {self.df.shape}")
             logger.info(f"Date range: {self.df['date'].min()} to {self.df['date'].max()}")
@@ -66,6 +99,157 @@ class BrentOilData:
             logger.error(f"Error loading data: {e}")
             raise
     
+    @staticmethod
+    def _parse_dates(raw: pd.Series) -> pd.Series:
+        """
+        Parse raw date strings, using the dataset's day-month-year format.
+        
+        Most rows follow '%d-%b-%y' (e.g. 20-May-87) and are parsed with that
+        explicit format; any remaining rows in other layouts are inferred.
+        """
+        dates = pd.to_datetime(raw, format='%d-%b-%y', errors='coerce', cache=True)
+        unparsed = dates.isna() & raw.notna()
+        if unparsed.any():
+            dates[unparsed] = pd.to_datetime(raw[unparsed], format='mixed', dayfirst=True)
+        return dates
+    
+    def load_cached(self, processed_dir: str = "data/processed"):
+        """
+        Load the cleaned dataset from the on-disk cache, if it is up to date.
+        
+        The Feather file is preferred (memory-mapped, no decoding), then the
+        Parquet file. Both are written by save_processed_data() and are only
+        used when newer than the raw CSV and storing float64 prices; prices
+        are converted to this instance's precision on load.
+        
+        Parameters
+        ----------
+        processed_dir : str
+            Directory containing brent_clean.feather / brent_clean.parquet
+            
+        Returns
+        -------
+        pd.DataFrame or None
+            Cleaned dataset indexed by date, or None if no valid cache exists
+        """
+        if pa is None:
+            return None
+        
+        for cache_path in (Path(processed_dir) / "brent_clean.feather",
+                           Path(processed_dir) / "brent_clean.parquet"):
+            if not cache_path.exists():
+                continue
+            if self.data_path.exists() and cache_path.stat().st_mtime < self.data_path.stat().st_mtime:
+                logger.info(f"Cache at {cache_path} is older than {self.data_path}; ignoring")
+                continue
+            
+            if cache_path.suffix == '.feather':
+                df = self._read_feather(cache_path)
+            else:
+                df = pd.read_parquet(cache_path, engine='pyarrow', memory_map=True)
+            if 'price' not in df or df['price'].dtype != np.float64:
+                logger.info(f"Cache at {cache_path} does not hold float64 prices; ignoring")
+                continue
+            
+            self.df = self._with_precision(df)
+            logger.info(f"Loaded cleaned data from cache {cache_path}. Shape: {self.df.shape}")
+            return self.df
+        
+        return None
+    
+    def _frame_for_disk(self) -> pd.DataFrame:
+        """
+        Cleaned dataset with float64 prices, as written by the save methods.
+        
+        float32 prices are widened through their shortest decimal repr, so a
+        price read as 18.76 is saved as 18.76 rather than 18.760000228881836.
+        """
+        prices = self.df['price'].to_numpy()
+        if prices.dtype == np.float64:
+            return self.df
+        return self.df.assign(price=prices.astype(str).astype(np.float64))
+    
+    def to_parquet(self, path):
+        """
+        Write the cleaned dataset as zstd-compressed Parquet.
+        
+        This is the only writer of brent_clean.parquet (save_processed_data()
+        and the dashboard's convert_data.py both use it), so the file always
+        has a 'date' column and float64 'price' column.
+        
+        Parameters
+        ----------
+        path : str or Path
+            Output file path
+        """
+        if self.df is None:
+            raise ValueError("No data to save")
+        if pa is None:
+            raise ImportError("pyarrow is required to write Parquet files")
+        
+        self._frame_for_disk().to_parquet(path, engine='pyarrow', compression='zstd')
+        logger.info(f"Saved cleaned prices to {path}")
+    
+    def to_feather(self, path):
+        """
+        Write the cleaned dataset as an uncompressed Arrow IPC (Feather) file.
+        
+        Uncompressed buffers can be memory-mapped by from_feather() without
+        decoding.
+        
+        Parameters
+        ----------
+        path : str or Path
+            Output file path
+        """
+        if self.df is None:
+            raise ValueError("No data to save")
+        if pa is None:
+            raise ImportError("pyarrow is required to write Feather files")
+        
+        pa_feather.write_feather(self._frame_for_disk().reset_index(), str(path),
+                                 compression='uncompressed')
+        logger.info(f"Saved cleaned prices to {path}")
+    
+    def from_feather(self, path) -> pd.DataFrame:
+        """
+        Load a dataset written by to_feather() through a memory map.
+        
+        Parameters
+        ----------
+        path : str or Path
+            Feather file path
+            
+        Returns
+        -------
+        pd.DataFrame
+            Cleaned dataset indexed by date
+        """
+        self.df = self._with_precision(self._read_feather(path))
+        
+        return self.df
+    
+    def _with_precision(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Cast prices to this instance's precision.
+        
+        Frames that already hold the right dtype are returned as-is, so a
+        memory-mapped float64 column is not copied by a no-op astype.
+        """
+        dtype = PRICE_DTYPES[self.precision]
+        if df['price'].dtype == dtype:
+            return df
+        return df.astype({'price': dtype})
+    
+    @staticmethod
+    def _read_feather(path) -> pd.DataFrame:
+        """Memory-map a Feather file into a date-indexed frame, as stored."""
+        if pa is None:
+            raise ImportError("pyarrow is required to read Feather files")
+        
+        table = pa_feather.read_table(str(path), memory_map=True)
+        return table.to_pandas(split_blocks=True, self_destruct=True).set_index('date')
+    
     def clean_data(self) -> pd.DataFrame:
         """
         Clean the loaded data.
@@ -80,29 +264,35 @@ class BrentOilData:
         
         logger.info("Cleaning data...")
         
-        # Remove duplicates
-        initial_rows = len(self.df)
-        self.df = self.df.drop_duplicates(subset=['date'])
-        logger.info(f"Removed {initial_rows - len(self.df)} duplicate rows")
-        
-        # Check for missing values
-        missing = self.df.isnull().sum()
-        if missing.any():
-            logger.warning(f"Missing values found:\n{missing}")
-            # Forward fill missing prices (common for time series)
-            self.df['price'] = self.df['price'].fillna(method='ffill')
-        
         # Ensure date is datetime
         self.df['date'] = pd.to_datetime(self.df['date'])
         
         # Set date as index
         self.df.set_index('date', inplace=True)
         
-        # Remove any zero or negative prices (data errors)
-        invalid_prices = (self.df['price'] <= 0).sum()
+        # Remove duplicate dates (keeping the last row for each), then sort once
+        initial_rows = len(self.df)
+        self.df = self.df[~self.df.index.duplicated(keep='last')].sort_index()
+        logger.info(f"Removed {initial_rows - len(self.df)} duplicate rows")
+        
+        prices = self.df['price'].to_numpy(dtype=np.float64, copy=True)
+        
+        # Check for missing values
+        missing = np.isnan(prices).sum()
+        if missing > 0:
+            logger.warning(f"Found {missing} missing prices")
+            # Forward fill missing prices (common for time series)
+            ffill_inplace(prices)
+            self.df['price'] = prices
+        
+        # Remove any zero, negative or still-missing prices (data errors)
+        valid = np.isfinite(prices) & (prices > 0.0)
+        invalid_prices = len(prices) - valid.sum()
         if invalid_prices > 0:
-            logger.warning(f"Found {invalid_prices} invalid prices (<= 0)")
-            self.df = self.df[self.df['price'] > 0]
+            logger.warning(f"Found {invalid_prices} invalid prices (<= 0 or missing)")
+            self.df = self.df[valid]
+        
+        self.df['price'] = self.df['price'].astype(PRICE_DTYPES[self.precision])
         
         logger.info(f"Cleaned data shape: {self.df.shape}")
         
@@ -128,14 +318,21 @@ class BrentOilData:
         logger.info("Calculating returns...")
         
         if log_returns:
-            # Log returns: log(P_t) - log(P_{t-1})
-            self.returns = np.log(self.df['price']).diff()
+            # Log returns: log(P_t / P_{t-1}) in one pass over the price array
+            prices = self.df['price'].to_numpy()
+            returns = np.log(prices[1:] / prices[:-1])
+            self.returns = pd.Series(returns, index=self.df.index[1:], name='log_return')
+            
+            # Drop returns touching missing prices
+            valid = ~np.isnan(returns)
+            if not valid.all():
+                self.returns = self.returns[valid]
         else:
             # Simple returns: (P_t - P_{t-1}) / P_{t-1}
             self.returns = self.df['price'].pct_change()
-        
-        # Remove first NaN value
-        self.returns = self.returns.dropna()
+            
+            # Remove first NaN value
+            self.returns = self.returns.dropna()
         
         logger.info(f"Returns calculated. Shape: {self.returns.shape}")
         
@@ -143,7 +340,7 @@ class BrentOilData:
     
     def save_processed_data(self, output_dir: str = "data/processed"):
         """
-        Save processed data to CSV files.
+        Save processed data to CSV (and Parquet/Feather, when pyarrow is available).
         
         Parameters
         ----------
@@ -157,10 +354,16 @@ class BrentOilData:
         output_path.mkdir(parents=True, exist_ok=True)
         
         # Save cleaned prices
+        df = self._frame_for_disk()
         prices_path = output_path / "brent_clean.csv"
-        self.df.to_csv(prices_path)
+        df.to_csv(prices_path)
         logger.info(f"Saved cleaned prices to {prices_path}")
         
+        # Parquet copy used by load_cached() and the dashboard backend
+        if pa is not None:
+            self.to_parquet(output_path / "brent_clean.parquet")
+            self.to_feather(output_path / "brent_clean.feather")
+        
         # Save returns if calculated
         if self.returns is not None:
             returns_path = output_path / "brent_returns.csv"
@@ -173,7 +376,9 @@ class BrentOilData:
 if __name__ == "__main__":
     # Example usage
     processor = BrentOilData()
-    df = processor.load_data()
-    df_clean = processor.clean_data()
+    df_clean = processor.load_cached()
+    if df_clean is None:
+        df = processor.load_data()
+        df_clean = processor.clean_data()
     returns = processor.calculate_returns()
     processor.save_processed_data()
\ No newline at end of file
@@ -3,23 +3,66 @@ Exploratory Data Analysis for Brent oil prices.
 Includes time series decomposition, stationarity tests, and volatility analysis.
 """
 
+import copy
+import functools
+import inspect
 import pandas as pd
 import numpy as np
 from scipy import stats
 from scipy.stats import jarque_bera
-import statsmodels.api as sm
-from statsmodels.tsa.stattools import adfuller, kpss
-from statsmodels.graphics.tsaplots import plot_acf, plot_pacf
-from arch import arch_model
+from _kernels import rolling_mean_std_abs, autocovariance_fft, pacf_durbin_levinson
+from data_processing import PRICE_DTYPES
 import warnings
 warnings.filterwarnings('ignore')
 
+def _cached_method(method):
+    """
+    Memoize an analyzer method in ``self._cache``.
+    
+    Calls are cached only when every Series argument is one of the analyzer's
+    own series (fixed at construction); other Series bypass the cache.
+    Arguments are bound to the method's signature with defaults applied, so
+    positional, keyword and omitted arguments share one cache entry, and
+    ``series=None`` is keyed as the price series it stands for. Each call
+    returns a deep copy, so callers can't alter the cached result.
+    """
+    signature = inspect.signature(method)
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        def key_of(value):
+            if isinstance(value, pd.Series):
+                if value is self.price_series:
+                    return 'price_series'
+                if value is self.log_returns:
+                    return 'log_returns'
+                raise KeyError
+            return value
+        
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = list(bound.arguments.items())[1:]
+        # series=None means the price series (see _as_array)
+        arguments = [(name, self.price_series if name == 'series' and value is None
+                      else value) for name, value in arguments]
+        try:
+            key = (method.__name__,
+                   tuple((name, key_of(value)) for name, value in arguments))
+            hash(key)
+        except (KeyError, TypeError):
+            return method(self, *args, **kwargs)
+        
+        if key not in self._cache:
+            self._cache[key] = method(self, *args, **kwargs)
+        return copy.deepcopy(self._cache[key])
+    
+    return wrapper
+
 class TimeSeriesAnalyzer:
     """Class for comprehensive time series analysis of Brent oil prices."""
-    def __init__(self):
-        self.jarque_bera=None
-
-    def __init__(self, data, date_column='date', price_column='price'):
+    
+    def __init__(self, data, date_column='date', price_column='price', precision='f64',
+                 log_returns=None):
         """
         Initialize analyzer with time series data.
         
@@ -31,22 +74,56 @@ class TimeSeriesAnalyzer:
             Name of date column (if index is not datetime)
         price_column : str
             Name of price column
+        precision : str
+            'f64' to keep prices and log returns as float64, 'f32' to hold
+            them as float32 in memory. Statistical tests, rolling kernels
+            and GARCH always run on float64.
+        log_returns : pd.Series, optional
+            Precomputed log returns of the price series (e.g.
+            BrentOilData.calculate_returns()); computed here if omitted
         """
+        if precision not in PRICE_DTYPES:
+            raise ValueError(f"Unknown precision: {precision}")
+        
         if not isinstance(data.index, pd.DatetimeIndex):
-            data = data.copy()
-            data.index = pd.to_datetime(data[date_column])
+            data = data.set_index(pd.to_datetime(data[date_column], cache=True), drop=False)
         
         self.data = data
-        self.price_series = data[price_column]
+        dtype = PRICE_DTYPES[precision]
+        self.price_series = data[price_column].astype(dtype, copy=False)
         self.date_column = date_column
         self.price_column = price_column
         
-        # Calculate log returns
-        self.log_returns = self._calculate_log_returns()
+        # Calculate log returns, unless the caller already has them
+        if log_returns is None:
+            self.log_returns = self._calculate_log_returns()
+        else:
+            self.log_returns = log_returns.dropna().astype(dtype, copy=False)
+        
+        # Memoized results of the _cached_method decorated analyses
+        self._cache = {}
+        
+        # NaN-free float64 arrays handed to the statsmodels/scipy routines
+        self._price_arr = self.price_series.dropna().to_numpy(dtype=np.float64)
+        self._returns_arr = self.log_returns.to_numpy(dtype=np.float64)
+        
+    def _as_array(self, series):
+        """NaN-free float64 array for a series, reusing the cached arrays."""
+        if series is None or series is self.price_series:
+            return self._price_arr
+        if series is self.log_returns:
+            return self._returns_arr
+        return series.dropna().to_numpy(dtype=np.float64)
         
     def _calculate_log_returns(self):
         """Calculate log returns for stationarity analysis."""
-        return np.log(self.price_series).diff().dropna()
+        prices = self.price_series.to_numpy()
+        returns = np.log(prices[1:] / prices[:-1])
+        log_returns = pd.Series(returns, index=self.price_series.index[1:],
+                                name=self.price_series.name)
+        
+        valid = ~np.isnan(returns)
+        return log_returns if valid.all() else log_returns[valid]
     
     def decompose_series(self, period=252, model='additive'):
         """
@@ -64,7 +141,10 @@ class TimeSeriesAnalyzer:
         dict
             Decomposition results
         """
-        decomposition = sm.tsa.seasonal_decompose(
+        # statsmodels and arch are imported where used; they dominate import time
+        from statsmodels.tsa.seasonal import seasonal_decompose
+        
+        decomposition = seasonal_decompose(
             self.price_series,
             model=model,
             period=period,
@@ -78,6 +158,7 @@ class TimeSeriesAnalyzer:
             'residual': decomposition.resid
         }
     
+    @_cached_method
     def test_stationarity(self, series=None, test='both'):
         """
         Test time series stationarity using ADF and KPSS tests.
@@ -94,14 +175,15 @@ class TimeSeriesAnalyzer:
         dict
             Test results
         """
-        if series is None:
-            series = self.price_series
+        from statsmodels.tsa.stattools import adfuller, kpss
+        
+        values = self._as_array(series)
         
         results = {}
         
         if test in ['adf', 'both']:
             # Augmented Dickey-Fuller test
-            adf_result = adfuller(series.dropna(), autolag='AIC')
+            adf_result = adfuller(values, autolag='AIC')
             results['adf'] = {
                 'statistic': adf_result[0],
                 'p_value': adf_result[1],
@@ -112,14 +194,14 @@ class TimeSeriesAnalyzer:
         if test in ['kpss', 'both']:
             # KPSS test
             try:
-                kpss_result = kpss(series.dropna(), regression='c', nlags='auto')
+                kpss_result = kpss(values, regression='c', nlags='auto')
                 results['kpss'] = {
                     'statistic': kpss_result[0],
                     'p_value': kpss_result[1],
                     'critical_values': kpss_result[3],
                     'stationary': kpss_result[1] > 0.05
                 }
-            except:
+            except (ValueError, np.linalg.LinAlgError):
                 results['kpss'] = {'error': 'Test failed'}
         
         return results
@@ -140,24 +222,36 @@ class TimeSeriesAnalyzer:
         dict
             Volatility analysis results
         """
-        # Rolling statistics
-        rolling_mean = self.log_returns.rolling(window=window).mean()
-        rolling_std = self.log_returns.rolling(window=window).std()
-        
-        # Volatility clustering analysis
-        abs_returns = np.abs(self.log_returns)
+        # Rolling statistics and absolute returns (volatility clustering) in one pass
+        index = self.log_returns.index
+        mean_arr, std_arr, abs_arr = rolling_mean_std_abs(
+            self.log_returns.to_numpy(dtype=np.float64), window
+        )
+        rolling_mean = pd.Series(mean_arr, index=index)
+        rolling_std = pd.Series(std_arr, index=index)
+        abs_returns = pd.Series(abs_arr, index=index)
         
         # GARCH model fitting
+        from arch import arch_model
+        
         garch_results = {}
         try:
-            garch_model = arch_model(self.log_returns.dropna() * 100, vol='Garch', 
+            # arch is better conditioned on percent returns; scale the input
+            # once and undo it in place on the fitted outputs
+            scaled = self._returns_arr * 100.0
+            garch_model = arch_model(scaled, vol='Garch', 
                                    p=garch_order[0], q=garch_order[1])
             garch_fit = garch_model.fit(disp='off', show_warning=False)
             
+            cond_vol = np.asarray(garch_fit.conditional_volatility, dtype=np.float64)
+            resid = np.asarray(garch_fit.resid, dtype=np.float64)
+            np.multiply(cond_vol, 0.01, out=cond_vol)
+            np.multiply(resid, 0.01, out=resid)
+            
             garch_results = {
                 'params': garch_fit.params,
-                'conditional_volatility': garch_fit.conditional_volatility / 100,
-                'residuals': garch_fit.resid / 100,
+                'conditional_volatility': pd.Series(cond_vol, index=index),
+                'residuals': pd.Series(resid, index=index),
                 'aic': garch_fit.aic,
                 'bic': garch_fit.bic
             }
@@ -171,34 +265,59 @@ class TimeSeriesAnalyzer:
             'garch': garch_results
         }
     
+    @_cached_method
     def calculate_statistics(self):
         """Calculate comprehensive descriptive statistics."""
+        price_arr = self._price_arr
+        ret_arr = self._returns_arr
+        
+        # One pass each for moments/extremes, and a single sort for the quantiles
+        price_desc = stats.describe(price_arr, bias=False)
+        ret_desc = stats.describe(ret_arr, bias=False)
+        q1, median, q3 = np.percentile(price_arr, [25, 50, 75])
+        ret_std = np.sqrt(ret_desc.variance)
+        var_95 = np.quantile(ret_arr, 0.05)
+        
         stats_dict = {
             'price': {
-                'mean': self.price_series.mean(),
-                'median': self.price_series.median(),
-                'std': self.price_series.std(),
-                'skewness': self.price_series.skew(),
-                'kurtosis': self.price_series.kurtosis(),
-                'min': self.price_series.min(),
-                'max': self.price_series.max(),
-                'q1': self.price_series.quantile(0.25),
-                'q3': self.price_series.quantile(0.75),
-                'iqr': self.price_series.quantile(0.75) - self.price_series.quantile(0.25)
+                'mean': price_desc.mean,
+                'median': median,
+                'std': np.sqrt(price_desc.variance),
+                'skewness': price_desc.skewness,
+                'kurtosis': price_desc.kurtosis,
+                'min': price_desc.minmax[0],
+                'max': price_desc.minmax[1],
+                'q1': q1,
+                'q3': q3,
+                'iqr': q3 - q1
             },
             'log_returns': {
-                'mean': self.log_returns.mean(),
-                'std': self.log_returns.std(),
-                'skewness': self.log_returns.skew(),
-                'kurtosis': self.log_returns.kurtosis(),
-                'sharpe': self.log_returns.mean() / self.log_returns.std() * np.sqrt(252),
-                'var_95': self.log_returns.quantile(0.05),
-                'cvar_95': self.log_returns[self.log_returns <= self.log_returns.quantile(0.05)].mean()
+                'mean': ret_desc.mean,
+                'std': ret_std,
+                'skewness': ret_desc.skewness,
+                'kurtosis': ret_desc.kurtosis,
+                'sharpe': ret_desc.mean / ret_std * np.sqrt(252),
+                'var_95': var_95,
+                'cvar_95': ret_arr[ret_arr <= var_95].mean()
             }
         }
         
         return stats_dict
     
+    @staticmethod
+    def _acf_pacf(values, lags):
+        """
+        ACF and PACF matching statsmodels' acf/pacf defaults.
+        
+        The ACF comes from one FFT autocovariance; the PACF solves the
+        Yule-Walker equations (adjusted autocovariance) by Durbin-Levinson.
+        """
+        n = len(values)
+        acov = autocovariance_fft(values, lags)
+        acov_adjusted = acov * n / (n - np.arange(lags + 1))
+        return acov / acov[0], pacf_durbin_levinson(acov_adjusted / acov_adjusted[0])
+    
+    @_cached_method
     def analyze_autocorrelation(self, lags=40):
         """
         Analyze autocorrelation and partial autocorrelation.
@@ -213,16 +332,16 @@ class TimeSeriesAnalyzer:
         dict
             Autocorrelation analysis results
         """
+        from statsmodels.stats.diagnostic import acorr_ljungbox
+        
         # ACF and PACF for prices
-        acf_price = sm.tsa.acf(self.price_series.dropna(), nlags=lags)
-        pacf_price = sm.tsa.pacf(self.price_series.dropna(), nlags=lags)
+        acf_price, pacf_price = self._acf_pacf(self._price_arr, lags)
         
         # ACF and PACF for log returns
-        acf_returns = sm.tsa.acf(self.log_returns.dropna(), nlags=lags)
-        pacf_returns = sm.tsa.pacf(self.log_returns.dropna(), nlags=lags)
+        acf_returns, pacf_returns = self._acf_pacf(self._returns_arr, lags)
         
         # Ljung-Box test for returns
-        lb_test = sm.stats.acorr_ljungbox(self.log_returns.dropna(), lags=[lags], return_df=True)
+        lb_test = acorr_ljungbox(self._returns_arr, lags=[lags], return_df=True)
         
         return {
             'acf_price': acf_price,
@@ -274,13 +393,9 @@ class TimeSeriesAnalyzer:
         
         # Distribution tests
         print(f"\n5. DISTRIBUTION TESTS")
-        p_value = jarque_bera(self.log_returns.dropna())[1]
+        p_value = jarque_bera(self._returns_arr)[1]
         print(f"   Jarque-Bera test p-value: {p_value:.6f}")
         
-
-
-        #print(f"   Jarque-Bera test p-value: {self.jarque_bera(self.log_returns.dropna())[1]:.6f}")
-        
         print("\n" + "=" * 70)
         
         return {
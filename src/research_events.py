@@ -3,193 +3,203 @@ Script to research and compile historical events affecting Brent oil prices.
 Focus on 2012-2022 period (past decade).
 """
 
+import csv
+import shutil
 import pandas as pd
 from datetime import datetime
 import requests
 import json
 from pathlib import Path
 
+SEVERITY_LEVELS = ['Low', 'Medium', 'High', 'Very High']
+
+# Researched events, built once at import; research_events_manual hands out
+# copies so callers can't modify the shared records.
+_EVENTS = [
+    # 2012-2014: Middle East tensions, shale boom
+    {
+        "event_date": "2012-07-01",
+        "event_name": "EU imposes oil embargo on Iran",
+        "event_type": "Geopolitical/Sanctions",
+        "description": "European Union imposes full oil embargo on Iran over nuclear program concerns",
+        "expected_impact": "Price increase due to supply concerns",
+        "region": "Middle East",
+        "severity": "High"
+    },
+    {
+        "event_date": "2014-06-20",
+        "event_name": "ISIS captures Iraqi oil fields",
+        "event_type": "Geopolitical/Conflict",
+        "description": "ISIS militants capture key oil fields in northern Iraq, disrupting production",
+        "expected_impact": "Price spike due to supply disruption fears",
+        "region": "Middle East",
+        "severity": "Medium"
+    },
+    {
+        "event_date": "2014-11-27",
+        "event_name": "OPEC maintains production despite price drop",
+        "event_type": "OPEC Decision",
+        "description": "OPEC decides to maintain production levels despite falling prices, targeting US shale producers",
+        "expected_impact": "Price decrease due to oversupply concerns",
+        "region": "Global",
+        "severity": "High"
+    },
+    
+    # 2015-2016: Iran nuclear deal, price collapse
+    {
+        "event_date": "2015-07-14",
+        "event_name": "Iran nuclear deal signed",
+        "event_type": "Geopolitical/Diplomatic",
+        "description": "P5+1 countries sign Joint Comprehensive Plan of Action with Iran, lifting oil sanctions",
+        "expected_impact": "Price decrease as Iranian oil returns to market",
+        "region": "Middle East",
+        "severity": "High"
+    },
+    {
+        "event_date": "2016-02-16",
+        "event_name": "Doha freeze agreement fails",
+        "event_type": "OPEC Decision",
+        "description": "OPEC and Russia fail to agree on production freeze at Doha meeting",
+        "expected_impact": "Price volatility and uncertainty",
+        "region": "Global",
+        "severity": "Medium"
+    },
+    {
+        "event_date": "2016-11-30",
+        "event_name": "OPEC+ production cut agreement",
+        "event_type": "OPEC Decision",
+        "description": "OPEC and non-OPEC producers agree to cut production by 1.8 million barrels per day",
+        "expected_impact": "Price increase due to coordinated supply reduction",
+        "region": "Global",
+        "severity": "High"
+    },
+    
+    # 2017-2018: US shale growth, geopolitical tensions
+    {
+        "event_date": "2017-11-05",
+        "event_name": "Saudi Arabia anti-corruption crackdown",
+        "event_type": "Geopolitical/Political",
+        "description": "Saudi Crown Prince arrests royals and businessmen in anti-corruption purge",
+        "expected_impact": "Price volatility due to political uncertainty",
+        "region": "Middle East",
+        "severity": "Medium"
+    },
+    {
+        "event_date": "2018-05-08",
+        "event_name": "US withdraws from Iran nuclear deal",
+        "event_type": "Geopolitical/Sanctions",
+        "description": "US unilaterally withdraws from JCPOA and reimposes sanctions on Iran",
+        "expected_impact": "Price increase due to expected supply reduction",
+        "region": "Middle East",
+        "severity": "High"
+    },
+    {
+        "event_date": "2018-12-07",
+        "event_name": "OPEC+ agrees to cut production",
+        "event_type": "OPEC Decision",
+        "description": "OPEC and allies agree to cut 1.2 million barrels per day to stabilize prices",
+        "expected_impact": "Price increase due to supply reduction",
+        "region": "Global",
+        "severity": "High"
+    },
+    
+    # 2019-2020: Pandemic, price war, unprecedented volatility
+    {
+        "event_date": "2019-09-14",
+        "event_name": "Drone attacks on Saudi Aramco facilities",
+        "event_type": "Geopolitical/Attack",
+        "description": "Drone attacks on Abqaiq and Khurais oil facilities disrupt 5.7 million bpd production",
+        "expected_impact": "Largest price spike in history due to supply shock",
+        "region": "Middle East",
+        "severity": "Very High"
+    },
+    {
+        "event_date": "2020-03-06",
+        "event_name": "OPEC+ price war begins",
+        "event_type": "OPEC Decision",
+        "description": "Russia rejects OPEC production cuts, leading to Saudi-Russia price war",
+        "expected_impact": "Price collapse due to oversupply fears",
+        "region": "Global",
+        "severity": "Very High"
+    },
+    {
+        "event_date": "2020-04-20",
+        "event_name": "WTI crude futures go negative",
+        "event_type": "Economic/Market",
+        "description": "WTI May 2020 futures contract closes at -$37.63 due to storage capacity concerns",
+        "expected_impact": "Extreme market volatility and panic selling",
+        "region": "Global",
+        "severity": "Very High"
+    },
+    {
+        "event_date": "2020-04-12",
+        "event_name": "OPEC+ historic production cut",
+        "event_type": "OPEC Decision",
+        "description": "OPEC+ agrees to cut 9.7 million bpd, largest reduction in history",
+        "expected_impact": "Price stabilization after historic collapse",
+        "region": "Global",
+        "severity": "Very High"
+    },
+    
+    # 2021-2022: Recovery, Ukraine conflict
+    {
+        "event_date": "2021-11-23",
+        "event_name": "US announces strategic petroleum reserve release",
+        "event_type": "Government Policy",
+        "description": "US coordinates with other countries to release 50 million barrels from SPR",
+        "expected_impact": "Temporary price decrease from increased supply",
+        "region": "North America",
+        "severity": "Medium"
+    },
+    {
+        "event_date": "2022-02-24",
+        "event_name": "Russia invades Ukraine",
+        "event_type": "Geopolitical/Conflict",
+        "description": "Full-scale Russian invasion of Ukraine begins",
+        "expected_impact": "Massive price spike due to sanctions and supply fears",
+        "region": "Europe",
+        "severity": "Very High"
+    },
+    {
+        "event_date": "2022-03-08",
+        "event_name": "US bans Russian oil imports",
+        "event_type": "Economic/Sanctions",
+        "description": "US announces ban on Russian oil, gas, and energy imports",
+        "expected_impact": "Further price increase and market dislocation",
+        "region": "Global",
+        "severity": "High"
+    },
+    {
+        "event_date": "2022-06-02",
+        "event_name": "EU agrees to partial Russian oil embargo",
+        "event_type": "Economic/Sanctions",
+        "description": "EU agrees to ban 90% of Russian oil imports by end of 2022",
+        "expected_impact": "Structural market change and price support",
+        "region": "Europe",
+        "severity": "High"
+    }
+]
+
 def research_events_manual():
     """
     Manual research based on known geopolitical and economic events.
     Returns a list of events with dates and descriptions.
     """
-    
-    events = [
-        # 2012-2014: Middle East tensions, shale boom
-        {
-            "event_date": "2012-07-01",
-            "event_name": "EU imposes oil embargo on Iran",
-            "event_type": "Geopolitical/Sanctions",
-            "description": "European Union imposes full oil embargo on Iran over nuclear program concerns",
-            "expected_impact": "Price increase due to supply concerns",
-            "region": "Middle East",
-            "severity": "High"
-        },
-        {
-            "event_date": "2014-06-20",
-            "event_name": "ISIS captures Iraqi oil fields",
-            "event_type": "Geopolitical/Conflict",
-            "description": "ISIS militants capture key oil fields in northern Iraq, disrupting production",
-            "expected_impact": "Price spike due to supply disruption fears",
-            "region": "Middle East",
-            "severity": "Medium"
-        },
-        {
-            "event_date": "2014-11-27",
-            "event_name": "OPEC maintains production despite price drop",
-            "event_type": "OPEC Decision",
-            "description": "OPEC decides to maintain production levels despite falling prices, targeting US shale producers",
-            "expected_impact": "Price decrease due to oversupply concerns",
-            "region": "Global",
-            "severity": "High"
-        },
-        
-        # 2015-2016: Iran nuclear deal, price collapse
-        {
-            "event_date": "2015-07-14",
-            "event_name": "Iran nuclear deal signed",
-            "event_type": "Geopolitical/Diplomatic",
-            "description": "P5+1 countries sign Joint Comprehensive Plan of Action with Iran, lifting oil sanctions",
-            "expected_impact": "Price decrease as Iranian oil returns to market",
-            "region": "Middle East",
-            "severity": "High"
-        },
-        {
-            "event_date": "2016-02-16",
-            "event_name": "Doha freeze agreement fails",
-            "event_type": "OPEC Decision",
-            "description": "OPEC and Russia fail to agree on production freeze at Doha meeting",
-            "expected_impact": "Price volatility and uncertainty",
-            "region": "Global",
-            "severity": "Medium"
-        },
-        {
-            "event_date": "2016-11-30",
-            "event_name": "OPEC+ production cut agreement",
-            "event_type": "OPEC Decision",
-            "description": "OPEC and non-OPEC producers agree to cut production by 1.8 million barrels per day",
-            "expected_impact": "Price increase due to coordinated supply reduction",
-            "region": "Global",
-            "severity": "High"
-        },
-        
-        # 2017-2018: US shale growth, geopolitical tensions
-        {
-            "event_date": "2017-11-05",
-            "event_name": "Saudi Arabia anti-corruption crackdown",
-            "event_type": "Geopolitical/Political",
-            "description": "Saudi Crown Prince arrests royals and businessmen in anti-corruption purge",
-            "expected_impact": "Price volatility due to political uncertainty",
-            "region": "Middle East",
-            "severity": "Medium"
-        },
-        {
-            "event_date": "2018-05-08",
-            "event_name": "US withdraws from Iran nuclear deal",
-            "event_type": "Geopolitical/Sanctions",
-            "description": "US unilaterally withdraws from JCPOA and reimposes sanctions on Iran",
-            "expected_impact": "Price increase due to expected supply reduction",
-            "region": "Middle East",
-            "severity": "High"
-        },
-        {
-            "event_date": "2018-12-07",
-            "event_name": "OPEC+ agrees to cut production",
-            "event_type": "OPEC Decision",
-            "description": "OPEC and allies agree to cut 1.2 million barrels per day to stabilize prices",
-            "expected_impact": "Price increase due to supply reduction",
-            "region": "Global",
-            "severity": "High"
-        },
-        
-        # 2019-2020: Pandemic, price war, unprecedented volatility
-        {
-            "event_date": "2019-09-14",
-            "event_name": "Drone attacks on Saudi Aramco facilities",
-            "event_type": "Geopolitical/Attack",
-            "description": "Drone attacks on Abqaiq and Khurais oil facilities disrupt 5.7 million bpd production",
-            "expected_impact": "Largest price spike in history due to supply shock",
-            "region": "Middle East",
-            "severity": "Very High"
-        },
-        {
-            "event_date": "2020-03-06",
-            "event_name": "OPEC+ price war begins",
-            "event_type": "OPEC Decision",
-            "description": "Russia rejects OPEC production cuts, leading to Saudi-Russia price war",
-            "expected_impact": "Price collapse due to oversupply fears",
-            "region": "Global",
-            "severity": "Very High"
-        },
-        {
-            "event_date": "2020-04-20",
-            "event_name": "WTI crude futures go negative",
-            "event_type": "Economic/Market",
-            "description": "WTI May 2020 futures contract closes at -$37.63 due to storage capacity concerns",
-            "expected_impact": "Extreme market volatility and panic selling",
-            "region": "Global",
-            "severity": "Very High"
-        },
-        {
-            "event_date": "2020-04-12",
-            "event_name": "OPEC+ historic production cut",
-            "event_type": "OPEC Decision",
-            "description": "OPEC+ agrees to cut 9.7 million bpd, largest reduction in history",
-            "expected_impact": "Price stabilization after historic collapse",
-            "region": "Global",
-            "severity": "Very High"
-        },
-        
-        # 2021-2022: Recovery, Ukraine conflict
-        {
-            "event_date": "2021-11-23",
-            "event_name": "US announces strategic petroleum reserve release",
-            "event_type": "Government Policy",
-            "description": "US coordinates with other countries to release 50 million barrels from SPR",
-            "expected_impact": "Temporary price decrease from increased supply",
-            "region": "North America",
-            "severity": "Medium"
-        },
-        {
-            "event_date": "2022-02-24",
-            "event_name": "Russia invades Ukraine",
-            "event_type": "Geopolitical/Conflict",
-            "description": "Full-scale Russian invasion of Ukraine begins",
-            "expected_impact": "Massive price spike due to sanctions and supply fears",
-            "region": "Europe",
-            "severity": "Very High"
-        },
-        {
-            "event_date": "2022-03-08",
-            "event_name": "US bans Russian oil imports",
-            "event_type": "Economic/Sanctions",
-            "description": "US announces ban on Russian oil, gas, and energy imports",
-            "expected_impact": "Further price increase and market dislocation",
-            "region": "Global",
-            "severity": "High"
-        },
-        {
-            "event_date": "2022-06-02",
-            "event_name": "EU agrees to partial Russian oil embargo",
-            "event_type": "Economic/Sanctions",
-            "description": "EU agrees to ban 90% of Russian oil imports by end of 2022",
-            "expected_impact": "Structural market change and price support",
-            "region": "Europe",
-            "severity": "High"
-        }
-    ]
-    
-    return events
+    return [dict(event) for event in _EVENTS]
 
 def create_event_dataframe():
     """Create DataFrame from researched events."""
     events = research_events_manual()
-    df = pd.DataFrame(events)
+    df = pd.DataFrame(events, columns=list(events[0]))
     
     # Ensure date is datetime
     df['event_date'] = pd.to_datetime(df['event_date'])
     
+    # Low-cardinality text columns as categoricals (int8 codes); severity is ordered
+    df['event_type'] = df['event_type'].astype('category')
+    df['region'] = df['region'].astype('category')
+    df['severity'] = pd.Categorical(df['severity'], categories=SEVERITY_LEVELS, ordered=True)
+    
     # Sort by date
     df = df.sort_values('event_date').reset_index(drop=True)
     
@@ -203,10 +213,31 @@ def save_events_to_csv(df, output_path="data/historical_events.csv"):
     df.to_csv(output_path, index=False)
     print(f"Saved {len(df)} events to {output_path}")
     
-    # Also save to processed folder for reference
+    # Also save to processed folder for reference (same bytes, no re-encoding)
     processed_path = Path("data/processed/historical_events.csv")
     processed_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(processed_path, index=False)
+    if processed_path.resolve() != output_path.resolve():
+        shutil.copyfile(output_path, processed_path)
+    
+    return output_path
+
+def write_events_csv(output_path="data/historical_events.csv", events=None):
+    """
+    Write researched events straight to CSV, sorted by date, without
+    building a DataFrame. Useful when only the CSV is needed.
+    """
+    if events is None:
+        events = research_events_manual()
+    events = sorted(events, key=lambda event: event['event_date'])
+    
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    with open(output_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(events[0]), lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(events)
+    print(f"Saved {len(events)} events to {output_path}")
     
     return output_path
 
@@ -219,26 +250,22 @@ def analyze_event_distribution(df):
     df['year'] = df['event_date'].dt.year
     yearly_counts = df['year'].value_counts().sort_index()
     print("\nEvents by year:")
-    for year, count in yearly_counts.items():
-        print(f"  {year}: {count}")
+    print(yearly_counts.to_string(header=False))
     
-    # Events by type
-    type_counts = df['event_type'].value_counts()
+    # Events by type (categorical columns count unused categories as 0; drop them)
+    type_counts = df['event_type'].value_counts()[lambda counts: counts > 0]
     print("\nEvents by type:")
-    for event_type, count in type_counts.items():
-        print(f"  {event_type}: {count}")
+    print(type_counts.to_string(header=False))
     
     # Events by severity
-    severity_counts = df['severity'].value_counts()
+    severity_counts = df['severity'].value_counts()[lambda counts: counts > 0]
     print("\nEvents by severity:")
-    for severity, count in severity_counts.items():
-        print(f"  {severity}: {count}")
+    print(severity_counts.to_string(header=False))
     
     # Events by region
-    region_counts = df['region'].value_counts()
+    region_counts = df['region'].value_counts()[lambda counts: counts > 0]
     print("\nEvents by region:")
-    for region, count in region_counts.items():
-        print(f"  {region}: {count}")
+    print(region_counts.to_string(header=False))
 
 def main():
     """Main function to research and save events."""
@@ -7,30 +7,69 @@ import numpy as np
 from datetime import datetime, timedelta
 from pathlib import Path
 import json
+import math
 import pickle
 import warnings
+from _kernels import rolling_stats, rolling_stats_parallel
 warnings.filterwarnings('ignore')
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; save_json/load_json fall back to json
+    orjson = None
+
 def ensure_directory(path):
     """Ensure directory exists, create if it doesn't."""
     Path(path).mkdir(parents=True, exist_ok=True)
     return Path(path)
 
+def _finite_or_none(obj):
+    """Replace NaN/inf floats with None, recursing into dicts, lists and tuples."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _finite_or_none(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite_or_none(value) for value in obj]
+    return obj
+
 def save_json(data, filepath):
-    """Save data as JSON file."""
-    with open(filepath, 'w') as f:
-        json.dump(data, f, indent=2, default=str)
+    """
+    Save data as JSON file.
+    
+    NaN and infinite floats are written as null, so they load back as None
+    whether or not orjson is installed (the stdlib json module would write
+    non-standard NaN/Infinity tokens).
+    """
+    if orjson is not None:
+        # numpy arrays/scalars and datetimes are serialized natively
+        options = (orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY |
+                   orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC)
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, option=options, default=str))
+    else:
+        with open(filepath, 'w') as f:
+            json.dump(_finite_or_none(data), f, indent=2, default=str)
     print(f"Saved JSON to {filepath}")
 
 def load_json(filepath):
     """Load data from JSON file."""
+    if orjson is not None:
+        with open(filepath, 'rb') as f:
+            return orjson.loads(f.read())
     with open(filepath, 'r') as f:
         return json.load(f)
 
 def save_pickle(data, filepath):
-    """Save data as pickle file."""
+    """
+    Save data as pickle file.
+    
+    Uses pickle protocol 5, which pickles contiguous numpy arrays (e.g. MCMC
+    traces) as in-band buffers written straight to the file. The result is a
+    standard pickle stream readable by pickle.load and pd.read_pickle.
+    """
     with open(filepath, 'wb') as f:
-        pickle.dump(data, f)
+        pickle.dump(data, f, protocol=5)
     print(f"Saved pickle to {filepath}")
 
 def load_pickle(filepath):
@@ -38,7 +77,10 @@ def load_pickle(filepath):
     with open(filepath, 'rb') as f:
         return pickle.load(f)
 
-def calculate_rolling_statistics(series, window=30):
+# Column order of the rolling statistics kernels' output
+ROLLING_STATISTICS = ('mean', 'std', 'min', 'max', 'median', 'q25', 'q75')
+
+def calculate_rolling_statistics(series, window=30, parallel=False):
     """
     Calculate rolling statistics for a time series.
     
@@ -48,21 +90,41 @@ def calculate_rolling_statistics(series, window=30):
         Time series data
     window : int
         Rolling window size
+    parallel : bool
+        Compute windows independently across threads. Does ~log(window) times
+        more work than the default single pass, so it only helps with many
+        cores available.
+        
+    Returns
+    -------
+    dict
+        One np.ndarray per statistic ('mean', 'std', 'min', 'max', 'median',
+        'q25', 'q75') plus the series' 'index'; see as_dataframe()
+    """
+    # All seven statistics from a single pass over the series
+    kernel = rolling_stats_parallel if parallel else rolling_stats
+    values = kernel(series.to_numpy(dtype=np.float64), window)
+    
+    stats = {name: values[:, i] for i, name in enumerate(ROLLING_STATISTICS)}
+    stats['index'] = series.index
+    return stats
+
+def as_dataframe(stats):
+    """
+    Convert calculate_rolling_statistics() output to a DataFrame.
+    
+    Parameters
+    ----------
+    stats : dict
+        Rolling statistics with an 'index' entry
         
     Returns
     -------
     pd.DataFrame
-        Rolling statistics
+        One column per statistic, indexed like the original series
     """
-    return pd.DataFrame({
-        'mean': series.rolling(window=window).mean(),
-        'std': series.rolling(window=window).std(),
-        'min': series.rolling(window=window).min(),
-        'max': series.rolling(window=window).max(),
-        'median': series.rolling(window=window).median(),
-        'q25': series.rolling(window=window).quantile(0.25),
-        'q75': series.rolling(window=window).quantile(0.75)
-    })
+    return pd.DataFrame({name: values for name, values in stats.items() if name != 'index'},
+                        index=stats['index'])
 
 def find_nearest_events(change_point_date, events_df, n_events=5):
     """
@@ -82,9 +144,30 @@ def find_nearest_events(change_point_date, events_df, n_events=5):
     pd.DataFrame
         Nearest events with distance in days
     """
-    events_df = events_df.copy()
-    events_df['days_from_change'] = (events_df['event_date'] - change_point_date).dt.days.abs()
-    nearest_events = events_df.nsmallest(n_events, 'days_from_change')
+    dates = events_df['event_date'].to_numpy(dtype='datetime64[D]')
+    days = np.abs((dates - np.datetime64(change_point_date, 'D')).astype(np.int64))
+    dated = ~np.isnat(dates)
+    
+    candidates = np.flatnonzero(dated)
+    if n_events <= 0:
+        candidates = candidates[:0]
+    elif n_events < len(candidates):
+        # O(M) selection of the n closest instead of a full sort; ties at the
+        # cut-off go to the earlier rows, as with nsmallest(keep='first')
+        distances = days[candidates]
+        cutoff = np.partition(distances, n_events - 1)[n_events - 1]
+        keep = distances < cutoff
+        keep[np.flatnonzero(distances == cutoff)[:n_events - keep.sum()]] = True
+        candidates = candidates[keep]
+    distances = days[candidates]
+    
+    # Like nsmallest, spare slots go to undated events, with no distance
+    undated = np.flatnonzero(~dated)[:max(n_events - len(candidates), 0)]
+    if undated.size:
+        candidates = np.concatenate([candidates, undated])
+        distances = np.concatenate([distances, np.full(undated.size, np.nan)])
+    
+    nearest_events = events_df.iloc[candidates].assign(days_from_change=distances)
     
     return nearest_events.sort_values('event_date')
 
@@ -114,42 +197,30 @@ def create_summary_table(impact_analysis, change_point_info, nearest_event):
     pd.DataFrame
         Summary table
     """
-    summary_data = {
-        'Metric': [
-            'Change Point Date',
-            '95% HDI Start',
-            '95% HDI End',
-            'Nearest Event',
-            'Event Date',
-            'Days Difference',
-            'Event Type',
-            'Event Severity',
-            'Mean Return Before',
-            'Mean Return After',
-            'Mean Change',
-            'Percent Change',
-            'Volatility Change',
-            'Effect Size'
-        ],
-        'Value': [
-            change_point_info['mode_date'].date(),
-            change_point_info['hdi_95_dates'][0].date(),
-            change_point_info['hdi_95_dates'][1].date(),
-            nearest_event['event_name'],
-            nearest_event['event_date'].date(),
-            abs((nearest_event['event_date'] - change_point_info['mode_date']).days),
-            nearest_event['event_type'],
-            nearest_event['severity'],
-            f"{impact_analysis['before']['mean']:.6f}",
-            f"{impact_analysis['after']['mean']:.6f}",
-            f"{impact_analysis['impact']['mean_change']:.6f}",
-            f"{impact_analysis['impact']['percent_change']:.2f}%",
-            f"{impact_analysis['impact']['volatility_change']:.6f}",
-            f"{impact_analysis['impact']['effect_size']:.3f}"
-        ]
-    }
+    mode_date = change_point_info['mode_date']
+    hdi_start, hdi_end = change_point_info['hdi_95_dates']
+    event_date = nearest_event['event_date']
+    before, after = impact_analysis['before'], impact_analysis['after']
+    impact = impact_analysis['impact']
     
-    return pd.DataFrame(summary_data)
+    rows = [
+        ('Change Point Date', mode_date.date()),
+        ('95% HDI Start', hdi_start.date()),
+        ('95% HDI End', hdi_end.date()),
+        ('Nearest Event', nearest_event['event_name']),
+        ('Event Date', event_date.date()),
+        ('Days Difference', abs((event_date - mode_date).days)),
+        ('Event Type', nearest_event['event_type']),
+        ('Event Severity', nearest_event['severity']),
+        ('Mean Return Before', f"{before['mean']:.6f}"),
+        ('Mean Return After', f"{after['mean']:.6f}"),
+        ('Mean Change', f"{impact['mean_change']:.6f}"),
+        ('Percent Change', f"{impact['percent_change']:.2f}%"),
+        ('Volatility Change', f"{impact['volatility_change']:.6f}"),
+        ('Effect Size', f"{impact['effect_size']:.3f}")
+    ]
+    
+    return pd.DataFrame(rows, columns=['Metric', 'Value'])
 
 def check_data_quality(df, date_column='date', price_column='price'):
     """
@@ -169,26 +240,46 @@ def check_data_quality(df, date_column='date', price_column='price'):
     dict
         Data quality report
     """
+    dates = df[date_column].to_numpy(dtype='datetime64[ns]')
+    prices = df[price_column].to_numpy(dtype=np.float64)
+    
+    # Dates: nulls, duplicates (NaT counts as one value) and backward steps
+    nat = np.isnat(dates)
+    valid_dates = dates[~nat]
+    steps = np.diff(dates.view(np.int64))
+    backward = (steps < 0) & ~nat[1:] & ~nat[:-1]
+    
+    # Prices: one NaN mask, then reductions over the valid values
+    missing = np.isnan(prices)
+    valid_prices = prices[~missing]
+    
     report = {
         'total_rows': len(df),
-        'date_range': (df[date_column].min(), df[date_column].max()),
-        'missing_dates': df[date_column].isnull().sum(),
-        'missing_prices': df[price_column].isnull().sum(),
-        'zero_prices': (df[price_column] == 0).sum(),
-        'negative_prices': (df[price_column] < 0).sum(),
-        'duplicate_dates': df[date_column].duplicated().sum(),
-        'date_order_violations': (df[date_column].diff().dt.days < 0).sum()
+        'date_range': ((pd.Timestamp(valid_dates.min()), pd.Timestamp(valid_dates.max()))
+                       if valid_dates.size else (pd.NaT, pd.NaT)),
+        'missing_dates': int(nat.sum()),
+        'missing_prices': int(missing.sum()),
+        'zero_prices': int((valid_prices == 0).sum()),
+        'negative_prices': int((valid_prices < 0).sum()),
+        'duplicate_dates': len(dates) - np.unique(dates).size,
+        'date_order_violations': int(backward.sum())
     }
     
     # Calculate statistics
-    report['price_statistics'] = {
-        'mean': df[price_column].mean(),
-        'median': df[price_column].median(),
-        'std': df[price_column].std(),
-        'min': df[price_column].min(),
-        'max': df[price_column].max(),
-        'q1': df[price_column].quantile(0.25),
-        'q3': df[price_column].quantile(0.75)
-    }
+    if valid_prices.size:
+        q1, median, q3 = np.quantile(valid_prices, [0.25, 0.5, 0.75])
+        report['price_statistics'] = {
+            'mean': valid_prices.mean(),
+            'median': median,
+            'std': valid_prices.std(ddof=1) if valid_prices.size > 1 else np.nan,
+            'min': valid_prices.min(),
+            'max': valid_prices.max(),
+            'q1': q1,
+            'q3': q3
+        }
+    else:
+        report['price_statistics'] = dict.fromkeys(
+            ['mean', 'median', 'std', 'min', 'max', 'q1', 'q3'], np.nan
+        )
     
     return report
\ No newline at end of file
@@ -2,30 +2,117 @@
 Visualization utilities for Brent oil price analysis.
 """
 
-import matplotlib.pyplot as plt
-import seaborn as sns
+import weakref
+from types import MappingProxyType
 import numpy as np
 import pandas as pd
-from matplotlib.patches import Rectangle
-import matplotlib.dates as mdates
+from _kernels import rolling_mean_std_abs, rolling_stats
+
+# matplotlib, seaborn and arviz are imported inside the plotting functions, so
+# importing this module does not load them
+
+# Rolling mean/std per (series id, window), evicted when the series is freed
+_ROLLING_CACHE = {}
+
+# Longest trace drawn per axis; longer traces are strided down to this
+MAX_TRACE_POINTS = 5000
+
+# Custom colors, shared read-only by every plotting function
+PLOT_COLORS = MappingProxyType({
+    'price': '#2E86AB',
+    'change_point': '#A23B72',
+    'before': '#3C91E6',
+    'after': '#FA824C',
+    'events': '#342E37',
+    'trend': '#F24236',
+    'volatility': '#7D82B8'
+})
+
+# Style most recently applied by set_plot_style()
+_current_style = None
 
 def set_plot_style(style='seaborn-darkgrid'):
-    """Set consistent plotting style."""
-    plt.style.use(style)
-    sns.set_palette("husl")
-    
-    # Custom colors
-    colors = {
-        'price': '#2E86AB',
-        'change_point': '#A23B72',
-        'before': '#3C91E6',
-        'after': '#FA824C',
-        'events': '#342E37',
-        'trend': '#F24236',
-        'volatility': '#7D82B8'
-    }
+    """Set consistent plotting style (rcParams are only reset when it changes)."""
+    global _current_style
+    if style != _current_style:
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        
+        plt.style.use(style)
+        sns.set_palette("husl")
+        _current_style = style
+    
+    return PLOT_COLORS
+
+def _rolling_mean_std(series, window):
+    """
+    Rolling mean and std of a series as arrays, cached while the series lives.
+    
+    Parameters
+    ----------
+    series : pd.Series
+        Time series data
+    window : int
+        Rolling window size
+        
+    Returns
+    -------
+    tuple of np.ndarray
+        (rolling_mean, rolling_std), NaN where the window is incomplete
+    """
+    key = (id(series), window)
+    cached = _ROLLING_CACHE.get(key)
+    if cached is not None and cached[0]() is series:
+        return cached[1], cached[2]
+    
+    values = series.to_numpy(dtype=np.float64)
+    if np.isnan(values).any():
+        stats = rolling_stats(values, window)
+        rolling_mean, rolling_std = stats[:, 0], stats[:, 1]
+    else:
+        rolling_mean, rolling_std, _ = rolling_mean_std_abs(values, window)
+    
+    _ROLLING_CACHE[key] = (weakref.ref(series), rolling_mean, rolling_std)
+    weakref.finalize(series, _ROLLING_CACHE.pop, key, None)
     
-    return colors
+    return rolling_mean, rolling_std
+
+def _band_polygons(x, lower, upper):
+    """
+    Closed polygons filling between lower and upper, one per run of finite values.
+    
+    Parameters
+    ----------
+    x : np.ndarray
+        Numeric x coordinates
+    lower, upper : np.ndarray
+        Band limits, NaN where undefined
+        
+    Returns
+    -------
+    list of np.ndarray
+        (k, 2) vertex arrays, as accepted by PolyCollection
+    """
+    finite = np.isfinite(lower) & np.isfinite(upper)
+    bounds = np.flatnonzero(np.diff(np.concatenate(([0], finite.view(np.int8), [0]))))
+    
+    polygons = []
+    for start, stop in zip(bounds[::2], bounds[1::2]):
+        xs = x[start:stop]
+        polygons.append(np.concatenate([
+            np.column_stack([xs, lower[start:stop]]),
+            np.column_stack([xs[::-1], upper[start:stop][::-1]])
+        ]))
+    return polygons
+
+def _posterior_draws(trace, var):
+    """
+    All posterior draws of a variable as a 1-D array.
+    
+    The posterior is stored contiguously, so this is a view rather than the
+    copy .flatten() would make.
+    """
+    return np.ascontiguousarray(trace.posterior[var].values).ravel()
 
 def plot_time_series_with_events(price_data, events_df, change_points=None, 
                                 figsize=(15, 8), title=None):
@@ -45,6 +132,10 @@ def plot_time_series_with_events(price_data, events_df, change_points=None,
     title : str, optional
         Plot title
     """
+    import matplotlib.pyplot as plt
+    import matplotlib.dates as mdates
+    from matplotlib.lines import Line2D
+    
     colors = set_plot_style()
     
     fig, ax = plt.subplots(figsize=figsize)
@@ -55,10 +146,9 @@ def plot_time_series_with_events(price_data, events_df, change_points=None,
     
     # Add change points if provided
     if change_points:
-        for i, cp_date in enumerate(change_points):
-            ax.axvline(x=cp_date, color=colors['change_point'], 
-                      linestyle='--', linewidth=2, alpha=0.8,
-                      label=f'Change Point {i+1}' if i == 0 else None)
+        ax.vlines(pd.to_datetime(list(change_points)), 0, 1, 
+                  transform=ax.get_xaxis_transform(), colors=colors['change_point'], 
+                  linestyles='--', linewidth=2, alpha=0.8, label='Change Point')
     
     # Add event markers with severity-based colors
     severity_colors = {
@@ -68,13 +158,14 @@ def plot_time_series_with_events(price_data, events_df, change_points=None,
         'Low': 'green'
     }
     
-    for _, event in events_df.iterrows():
-        color = severity_colors.get(event['severity'], 'gray')
-        ax.axvline(x=event['event_date'], color=color, 
-                  linestyle=':', alpha=0.5, linewidth=1)
+    # One vlines call for all events; unknown severities (code -1) map to gray
+    palette = np.array(list(severity_colors.values()) + ['gray'])
+    codes = pd.Categorical(events_df['severity'], categories=list(severity_colors)).codes
+    ax.vlines(events_df['event_date'].to_numpy(), 0, 1, 
+              transform=ax.get_xaxis_transform(), colors=palette[codes], 
+              linestyles=':', alpha=0.5, linewidth=1)
     
     # Custom legend for events
-    from matplotlib.lines import Line2D
     legend_elements = [
         Line2D([0], [0], color=colors['price'], lw=2, label='Brent Price'),
     ]
@@ -119,7 +210,7 @@ def plot_change_point_analysis(price_data, change_point_date, window_days=60,
     Parameters
     ----------
     price_data : pd.Series
-        Price time series
+        Price time series, indexed by date in ascending order
     change_point_date : pd.Timestamp
         Detected change point date
     window_days : int
@@ -127,14 +218,21 @@ def plot_change_point_analysis(price_data, change_point_date, window_days=60,
     figsize : tuple
         Figure size
     """
+    import matplotlib.pyplot as plt
+    import matplotlib.dates as mdates
+    from matplotlib.collections import PolyCollection
+    
     colors = set_plot_style()
     
     # Create subplots
     fig, axes = plt.subplots(2, 2, figsize=figsize)
     
+    # Positional view of the prices for the searchsorted slices below
+    prices = price_data.to_numpy()
+    
     # 1. Full series with change point
     ax1 = axes[0, 0]
-    ax1.plot(price_data.index, price_data.values, 
+    ax1.plot(price_data.index, prices, 
             linewidth=1, color=colors['price'], alpha=0.7)
     ax1.axvline(x=change_point_date, color=colors['change_point'], 
                linestyle='--', linewidth=2)
@@ -148,10 +246,13 @@ def plot_change_point_analysis(price_data, change_point_date, window_days=60,
     window_start = change_point_date - pd.Timedelta(days=window_days)
     window_end = change_point_date + pd.Timedelta(days=window_days)
     
-    mask = (price_data.index >= window_start) & (price_data.index <= window_end)
-    window_data = price_data[mask]
+    # The index is sorted, so every region below is a contiguous slice
+    window = slice(price_data.index.searchsorted(window_start, side='left'),
+                   price_data.index.searchsorted(window_end, side='right'))
+    split = price_data.index.searchsorted(change_point_date, side='left')
+    before, after = slice(None, split), slice(split, None)
     
-    ax2.plot(window_data.index, window_data.values, 
+    ax2.plot(price_data.index[window], prices[window], 
             linewidth=1.5, color=colors['price'])
     ax2.axvline(x=change_point_date, color=colors['change_point'], 
                linestyle='--', linewidth=2)
@@ -177,26 +278,28 @@ def plot_change_point_analysis(price_data, change_point_date, window_days=60,
     
     # Calculate rolling mean and std
     rolling_window = 10
-    rolling_mean = price_data.rolling(window=rolling_window).mean()
-    rolling_std = price_data.rolling(window=rolling_window).std()
+    rolling_mean, rolling_std = _rolling_mean_std(price_data, rolling_window)
     
     # Plot before change point
-    before_mask = price_data.index < change_point_date
-    ax3.plot(price_data.index[before_mask], rolling_mean[before_mask], 
+    ax3.plot(price_data.index[before], rolling_mean[before], 
             color=colors['before'], label='Rolling Mean (Before)', alpha=0.7)
-    ax3.fill_between(price_data.index[before_mask],
-                     rolling_mean[before_mask] - rolling_std[before_mask],
-                     rolling_mean[before_mask] + rolling_std[before_mask],
-                     color=colors['before'], alpha=0.2, label='±1 STD')
     
     # Plot after change point
-    after_mask = price_data.index >= change_point_date
-    ax3.plot(price_data.index[after_mask], rolling_mean[after_mask], 
+    ax3.plot(price_data.index[after], rolling_mean[after], 
             color=colors['after'], label='Rolling Mean (After)', alpha=0.7)
-    ax3.fill_between(price_data.index[after_mask],
-                     rolling_mean[after_mask] - rolling_std[after_mask],
-                     rolling_mean[after_mask] + rolling_std[after_mask],
-                     color=colors['after'], alpha=0.2)
+    
+    # ±1 STD bands for both regions as a single collection
+    x = mdates.date2num(price_data.index)
+    lower = rolling_mean - rolling_std
+    upper = rolling_mean + rolling_std
+    polygons, facecolors = [], []
+    for region, color in ((before, colors['before']), (after, colors['after'])):
+        region_polygons = _band_polygons(x[region], lower[region], upper[region])
+        polygons.extend(region_polygons)
+        facecolors.extend([color] * len(region_polygons))
+    ax3.add_collection(PolyCollection(polygons, facecolors=facecolors, 
+                                      alpha=0.2, label='±1 STD'))
+    ax3.autoscale_view()
     
     ax3.axvline(x=change_point_date, color=colors['change_point'], 
                linestyle='--', linewidth=2, label='Change Point')
@@ -211,21 +314,30 @@ def plot_change_point_analysis(price_data, change_point_date, window_days=60,
     ax4 = axes[1, 1]
     
     # Extract data before and after
-    before_data = price_data[before_mask].dropna()
-    after_data = price_data[after_mask].dropna()
+    before_data = prices[before]
+    before_data = before_data[~np.isnan(before_data)]
+    after_data = prices[after]
+    after_data = after_data[~np.isnan(after_data)]
     
-    # Histograms
+    # Histograms on shared bin edges, so the two distributions line up
     bins = 50
-    ax4.hist(before_data, bins=bins, density=True, alpha=0.5, 
-            color=colors['before'], label=f'Before (n={len(before_data)})')
-    ax4.hist(after_data, bins=bins, density=True, alpha=0.5,
-            color=colors['after'], label=f'After (n={len(after_data)})')
+    edges = np.histogram_bin_edges(np.concatenate([before_data, after_data]), bins=bins)
+    centers = 0.5 * (edges[:-1] + edges[1:])
+    for data, color, label in ((before_data, colors['before'], 'Before'),
+                               (after_data, colors['after'], 'After')):
+        density = (np.histogram(data, bins=edges, density=True)[0]
+                   if len(data) else np.zeros(bins))
+        # Draw the precomputed densities: one weighted point per bin
+        ax4.hist(centers, bins=edges, weights=density, alpha=0.5, 
+                color=color, label=f'{label} (n={len(data)})')
     
     # Add vertical lines for means
-    ax4.axvline(before_data.mean(), color=colors['before'], 
-               linestyle='--', linewidth=2, label=f'Before Mean: ${before_data.mean():.2f}')
-    ax4.axvline(after_data.mean(), color=colors['after'], 
-               linestyle='--', linewidth=2, label=f'After Mean: ${after_data.mean():.2f}')
+    before_mean = before_data.mean()
+    after_mean = after_data.mean()
+    ax4.axvline(before_mean, color=colors['before'], 
+               linestyle='--', linewidth=2, label=f'Before Mean: ${before_mean:.2f}')
+    ax4.axvline(after_mean, color=colors['after'], 
+               linestyle='--', linewidth=2, label=f'After Mean: ${after_mean:.2f}')
     
     ax4.set_title('Price Distribution Before/After Change', fontsize=14)
     ax4.set_xlabel('Price (USD)')
@@ -239,7 +351,7 @@ def plot_change_point_analysis(price_data, change_point_date, window_days=60,
     
     return fig, axes
 
-def plot_model_diagnostics(trace, var_names=None, figsize=(15, 10)):
+def plot_model_diagnostics(trace, var_names=None, figsize=(15, 10), fig=None):
     """
     Plot MCMC diagnostics for model evaluation.
     
@@ -251,33 +363,55 @@ def plot_model_diagnostics(trace, var_names=None, figsize=(15, 10)):
         Variables to plot
     figsize : tuple
         Figure size
+    fig : matplotlib.figure.Figure, optional
+        Figure returned by a previous call; its trace lines are updated in
+        place instead of creating a new figure
     """
     import arviz as az
+    import matplotlib.pyplot as plt
     
     if var_names is None:
         var_names = list(trace.posterior.data_vars)[:4]
+    var_names = var_names[:4]
     
-    fig, axes = plt.subplots(2, 2, figsize=figsize)
-    axes = axes.flatten()
+    if fig is None:
+        fig, axes = plt.subplots(2, 2, figsize=figsize)
+        axes = axes.flatten()
+    else:
+        axes = np.asarray(fig.axes[:4])
     
-    for i, var in enumerate(var_names[:4]):
+    for i, var in enumerate(var_names):
         # Trace plot
         ax = axes[i]
-        var_data = trace.posterior[var].values.flatten()
+        var_data = _posterior_draws(trace, var)
         
-        # Plot trace
-        ax.plot(var_data, alpha=0.7)
+        # Stride long traces down; the plot can't show more points than this
+        stride = max(1, -(-var_data.size // MAX_TRACE_POINTS))
+        x = np.arange(0, var_data.size, stride)
+        y = var_data[::stride]
+        
+        # Plot trace, reusing the existing line when redrawing a figure
+        if ax.lines:
+            ax.lines[0].set_data(x, y)
+            ax.relim()
+            ax.autoscale_view()
+        else:
+            ax.plot(x, y, alpha=0.7)
         ax.set_title(f'Trace Plot: {var}', fontsize=12)
         ax.set_xlabel('Sample')
         ax.set_ylabel('Value')
         ax.grid(True, alpha=0.3)
     
-    plt.suptitle('MCMC Diagnostics - Trace Plots', fontsize=16, fontweight='bold', y=1.02)
-    plt.tight_layout()
+    # Clear panels left over from a previous call with more variables
+    for ax in axes[len(var_names):]:
+        ax.clear()
+    
+    fig.suptitle('MCMC Diagnostics - Trace Plots', fontsize=16, fontweight='bold', y=1.02)
+    fig.tight_layout()
     
     return fig, axes
 
-def plot_posterior_distributions(trace, var_names=None, figsize=(15, 8)):
+def plot_posterior_distributions(trace, var_names=None, figsize=(15, 8), fig=None):
     """
     Plot posterior distributions with HDI intervals.
     
@@ -289,8 +423,12 @@ def plot_posterior_distributions(trace, var_names=None, figsize=(15, 8)):
         Variables to plot
     figsize : tuple
         Figure size
+    fig : matplotlib.figure.Figure, optional
+        Figure returned by a previous call with the same number of variables;
+        its axes are cleared and redrawn instead of creating a new figure
     """
     import arviz as az
+    import matplotlib.pyplot as plt
     
     if var_names is None:
         var_names = list(trace.posterior.data_vars)
@@ -299,12 +437,26 @@ def plot_posterior_distributions(trace, var_names=None, figsize=(15, 8)):
     n_cols = min(3, n_vars)
     n_rows = (n_vars + n_cols - 1) // n_cols
     
-    fig, axes = plt.subplots(n_rows, n_cols, figsize=figsize)
-    
-    if n_vars == 1:
-        axes = [axes]
-    elif n_rows > 1 and n_cols > 1:
-        axes = axes.flatten()
+    if fig is None:
+        fig, axes = plt.subplots(n_rows, n_cols, figsize=figsize)
+        
+        if n_vars == 1:
+            axes = [axes]
+        elif n_rows > 1 and n_cols > 1:
+            axes = axes.flatten()
+    else:
+        axes = fig.axes
+        for ax in axes:
+            ax.clear()
+            ax.set_visible(True)
+    
+    # HDIs and means of the plotted scalar variables in one reduction each;
+    # vector-valued variables get one HDI over all their elements below
+    posterior = trace.posterior[var_names[:len(axes)]]
+    scalar_vars = [var for var in posterior.data_vars
+                   if posterior[var].dims == ('chain', 'draw')]
+    hdi_ds = az.hdi(posterior, var_names=scalar_vars, hdi_prob=0.95) if scalar_vars else {}
+    means = posterior.mean()
     
     for i, var in enumerate(var_names):
         ax = axes[i] if i < len(axes) else None
@@ -312,18 +464,21 @@ def plot_posterior_distributions(trace, var_names=None, figsize=(15, 8)):
             break
             
         # Plot posterior density
-        var_data = trace.posterior[var].values.flatten()
+        var_data = _posterior_draws(trace, var)
         
         # Histogram
         ax.hist(var_data, bins=50, density=True, alpha=0.7, 
                edgecolor='black', linewidth=0.5)
         
         # Add HDI
-        hdi = az.hdi(var_data, hdi_prob=0.95)
+        if var in scalar_vars:
+            hdi = hdi_ds[var].values
+        else:
+            hdi = az.hdi(var_data, hdi_prob=0.95)
         ax.axvspan(hdi[0], hdi[1], alpha=0.2, color='gray', label='95% HDI')
         
         # Add mean line
-        mean_val = var_data.mean()
+        mean_val = float(means[var])
         ax.axvline(mean_val, color='red', linestyle='--', 
                   linewidth=2, label=f'Mean: {mean_val:.3f}')
         
@@ -337,7 +492,7 @@ def plot_posterior_distributions(trace, var_names=None, figsize=(15, 8)):
     for j in range(i + 1, len(axes)):
         axes[j].set_visible(False)
     
-    plt.suptitle('Posterior Distributions', fontsize=16, fontweight='bold', y=1.02)
-    plt.tight_layout()
+    fig.suptitle('Posterior Distributions', fontsize=16, fontweight='bold', y=1.02)
+    fig.tight_layout()
     
     return fig, axes
\ No newline at end of file
@@ -0,0 +1,213 @@
+"""
+Tests for the dashboard API, run against synthetic data files: the payload
+format (ISO 8601 UTC date strings and plain float values, identical across
+price, event and impact records) and the values the endpoints compute.
+"""
+
+import pickle
+import warnings
+
+import numpy as np
+import orjson
+import pandas as pd
+import pytest
+
+import app as backend
+
+ISO_MIDNIGHT_UTC = "T00:00:00+00:00"
+
+
+def price_frame(prices, start="2012-06-25"):
+    """Daily price frame indexed by date."""
+    dates = pd.date_range(start, periods=len(prices), freq="D", name="date")
+    return pd.DataFrame({"price": prices}, index=dates)
+
+
+@pytest.fixture
+def prices():
+    """Cleaned prices served by the test client (override by parametrizing)."""
+    return price_frame(np.linspace(18.76, 20.66, 20))
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch, prices):
+    """Test client backed by a DataManager loaded from synthetic files."""
+    processed = tmp_path / "data" / "processed"
+    tables = tmp_path / "results" / "tables"
+    saved = tmp_path / "models" / "saved" / "single_change_point"
+    for directory in (processed, tables, saved):
+        directory.mkdir(parents=True)
+
+    prices.iloc[::-1].to_csv(processed / "brent_clean.csv")
+    pd.DataFrame({
+        "event_date": ["2012-07-01", "2012-07-10"],
+        "event_name": ["EU imposes oil embargo on Iran", "OPEC meeting"],
+        "event_type": ["Geopolitical/Sanctions", "OPEC Decision"],
+        "region": ["Middle East", "Global"],
+        "severity": ["High", "Medium"],
+    }).to_csv(processed / "historical_events.csv", index=False)
+    pd.DataFrame({
+        "change_point_date": ["2012-07-05"],
+        "percent_change": [-66.99050315351894],
+    }).to_csv(tables / "impact_analysis.csv", index=False)
+    with open(saved / "change_points.pkl", "wb") as f:
+        pickle.dump({"mode_date": pd.Timestamp("2012-07-05")}, f)
+
+    monkeypatch.setattr(backend, "DATA_DIR", tmp_path / "data")
+    monkeypatch.setattr(backend, "RESULTS_DIR", tmp_path / "results")
+    monkeypatch.setattr(backend, "MODELS_DIR", tmp_path / "models")
+    monkeypatch.setattr(backend, "data_manager", backend.DataManager())
+    for cached in (backend.cached_price_chunks, backend.cached_events_chunks,
+                   backend.cached_stats_payload):
+        cached.cache_clear()
+
+    yield backend.app.test_client()
+
+    for cached in (backend.cached_price_chunks, backend.cached_events_chunks,
+                   backend.cached_stats_payload):
+        cached.cache_clear()
+
+
+def get_json(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return orjson.loads(response.get_data())
+
+
+def test_price_records_have_iso_dates_and_float_prices(client):
+    payload = get_json(client, "/api/prices")
+
+    assert payload["success"] is True
+    assert payload["count"] == len(payload["data"]) == 20
+    first = payload["data"][0]
+    assert first == {"date": "2012-06-25" + ISO_MIDNIGHT_UTC, "price": 18.76}
+    assert payload["data"][-1]["date"] == "2012-07-14" + ISO_MIDNIGHT_UTC
+    assert all(type(record["price"]) is float for record in payload["data"])
+
+
+def test_price_range_filter_is_inclusive(client):
+    payload = get_json(client, "/api/prices?start_date=2012-07-01&end_date=2012-07-03")
+
+    assert [record["date"][:10] for record in payload["data"]] == [
+        "2012-07-01", "2012-07-02", "2012-07-03"]
+
+
+def test_event_dates_match_price_date_format(client):
+    events = get_json(client, "/api/events")["data"]
+    price_dates = {record["date"] for record in get_json(client, "/api/prices")["data"]}
+
+    assert [event["event_date"] for event in events] == [
+        "2012-07-01" + ISO_MIDNIGHT_UTC, "2012-07-10" + ISO_MIDNIGHT_UTC]
+    assert all(event["event_date"] in price_dates for event in events)
+
+
+def test_event_filters(client):
+    events = get_json(client, "/api/events?type=OPEC%20Decision")["data"]
+
+    assert [event["event_name"] for event in events] == ["OPEC meeting"]
+
+
+def test_only_unfiltered_payloads_are_cached(client):
+    full = client.get("/api/prices").get_data()
+    get_json(client, "/api/events")
+    for day in range(1, 10):
+        get_json(client, f"/api/prices?start_date=2012-07-0{day}")
+        get_json(client, f"/api/events?type=OPEC%20Decision&end_date=2012-07-0{day}")
+
+    assert backend.cached_price_chunks.cache_info().currsize == 1
+    assert backend.cached_events_chunks.cache_info().currsize == 1
+    assert client.get("/api/prices").get_data() == full
+
+
+def test_impact_and_change_point_dates_are_iso_utc(client):
+    impact = get_json(client, "/api/impact")["data"]
+    change_points = get_json(client, "/api/change-points")["data"]
+
+    assert impact == [{"change_point_date": "2012-07-05" + ISO_MIDNIGHT_UTC,
+                       "percent_change": -66.99050315351894}]
+    assert change_points["mode_date"] == "2012-07-05" + ISO_MIDNIGHT_UTC
+
+
+def test_stats_values_are_plain_numbers(client):
+    stats = get_json(client, "/api/stats")["data"]
+
+    assert stats["total_observations"] == 20
+    assert stats["date_range"] == {"start": "2012-06-25", "end": "2012-07-14"}
+    assert stats["price_stats"]["min"] == 18.76
+    assert stats["price_stats"]["max"] == 20.66
+    assert stats["events_by_severity"] == {"High": 1, "Medium": 1}
+
+
+def test_invalid_date_is_rejected(client):
+    response = client.get("/api/prices?start_date=not-a-date")
+
+    assert response.status_code == 400
+    assert "error" in orjson.loads(response.get_data())
+
+
+@pytest.mark.parametrize("value", [
+    "2012-07-01", "2012-07-01T00:00:00", "2012-07-01T00:00:00+00:00", "2012-07-01T00:00:00Z",
+    "07/01/2012", "2012/07/01", "Sun, 01 Jul 2012 00:00:00 GMT", "2012-07-01T02:00:00+02:00",
+])
+def test_parse_date_accepts_iso_and_other_formats(value):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        parsed = backend.parse_date(value)
+
+    assert parsed == np.datetime64("2012-07-01", "ns")
+    assert parsed.dtype == np.dtype("datetime64[ns]")
+
+
+def test_event_impact_accepts_event_dates_from_the_api(client):
+    event_date = get_json(client, "/api/events")["data"][0]["event_date"]
+
+    payload = get_json(client, f"/api/event-impact/{event_date}?window_days=3")
+
+    assert payload["success"] is True
+    assert len(payload["data"]["price_data"]) == 7
+
+
+def test_event_impact_means_match_pandas_masks(client, prices):
+    event_date = pd.Timestamp("2012-07-05")
+    window = pd.Timedelta(days=4)
+    in_window = prices[(prices.index >= event_date - window) & (prices.index <= event_date + window)]
+    before_mean = in_window[in_window.index < event_date]["price"].mean()
+    after_mean = in_window[in_window.index >= event_date]["price"].mean()
+
+    data = get_json(client, "/api/event-impact/2012-07-05?window_days=4")["data"]
+
+    assert [record["price"] for record in data["price_data"]] == pytest.approx(
+        in_window["price"].tolist(), rel=1e-12)
+    assert data["metrics"]["before_mean"] == pytest.approx(before_mean, rel=1e-12)
+    assert data["metrics"]["after_mean"] == pytest.approx(after_mean, rel=1e-12)
+    assert data["metrics"]["percent_change"] == pytest.approx(
+        (after_mean - before_mean) / before_mean * 100, rel=1e-9)
+
+
+@pytest.mark.parametrize("prices", [
+    price_frame(60.0 * np.exp(np.cumsum(np.random.default_rng(3).normal(0.0, 0.02, 300))))
+])
+def test_volatility_matches_pandas_rolling_std(client, prices):
+    returns = np.log(prices["price"]).diff().dropna()
+
+    data = get_json(client, "/api/volatility")["data"]
+
+    assert data["daily_volatility"] == pytest.approx(returns.std(), rel=1e-12)
+    assert data["annualized_volatility"] == pytest.approx(returns.std() * np.sqrt(252), rel=1e-12)
+    for window in (30, 90):
+        expected = returns.rolling(window).std().iloc[-1] * np.sqrt(252)
+        assert data[f"rolling_{window}d_vol"] == pytest.approx(expected, rel=1e-9)
+    expected_drawdown = (prices["price"] / prices["price"].cummax() - 1).min()
+    assert data["max_drawdown"] == pytest.approx(expected_drawdown, rel=1e-12)
+
+
+def test_volatility_windows_longer_than_history_are_null(client):
+    data = get_json(client, "/api/volatility")["data"]
+
+    assert data["rolling_30d_vol"] is None and data["rolling_90d_vol"] is None
+
+
+def test_json_default_falls_back_to_str():
+    assert backend.json_default(pd.Timestamp("2012-07-01")) == pd.Timestamp("2012-07-01").to_pydatetime()
+    assert backend.json_default(pd.NaT) is None
+    assert backend.json_default({1}) == "{1}"
@@ -0,0 +1,44 @@
+"""
+Tests for the change point models in src/change_point_model.py.
+"""
+
+import numpy as np
+import pandas as pd
+import pytensor
+import pytensor.tensor as pt
+import pytest
+
+from change_point_model import BayesianChangePointModel
+
+
+def reference_segments(changepoints, n_obs):
+    """The per-observation loop the searchsorted segment index replaces."""
+    segment_idx = 0
+    segments = np.empty(n_obs, dtype=int)
+    for i in range(n_obs):
+        if segment_idx < len(changepoints) and i >= changepoints[segment_idx]:
+            segment_idx += 1
+        segments[i] = segment_idx
+    return segments
+
+
+@pytest.mark.parametrize("taus", [
+    [0.25, 0.25, 0.25, 0.25],
+    [0.02, 0.5, 0.46, 0.02],
+    [0.01, 0.33, 0.33, 0.33],
+    [0.33, 0.33, 0.33, 0.01],
+    [0.137, 0.291, 0.318, 0.254],
+])
+def test_multiple_change_point_segments_match_loop(taus):
+    n_obs = 50
+    data = pd.Series(np.zeros(n_obs), index=pd.date_range('2012-01-02', periods=n_obs))
+    model = BayesianChangePointModel(data).build_multiple_change_points_model(3)
+
+    # With mus = 0, 1, 2, 3 the mean of each observation is its segment index
+    mean = pytensor.clone_replace(model['mean'], {
+        model['taus']: pt.constant(np.array(taus)),
+        model['mus']: pt.constant(np.arange(4.0)),
+    })
+    changepoints = np.cumsum(np.array(taus) * n_obs).astype(int)[:3]
+
+    np.testing.assert_array_equal(mean.eval(), reference_segments(changepoints, n_obs))
@@ -0,0 +1,110 @@
+"""
+Tests for BrentOilData cleaning and the on-disk cache of the cleaned prices.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_processing import BrentOilData
+
+
+def reference_clean(raw):
+    """The pandas cleaning steps clean_data replaces: last row per date, sorted."""
+    df = raw.drop_duplicates(subset=['date'], keep='last')
+    df = df.set_index(pd.to_datetime(df['date'])).drop(columns='date').sort_index()
+    df['price'] = df['price'].ffill()
+    return df[df['price'] > 0]
+
+
+def clean(raw):
+    processor = BrentOilData(data_path="missing.csv")
+    processor.df = raw.copy()
+    return processor.clean_data()
+
+
+@pytest.fixture
+def raw_csv(tmp_path):
+    """Raw price CSV in the dataset's day-month-year format."""
+    path = tmp_path / "raw" / "BrentOilPrices.csv"
+    path.parent.mkdir()
+    path.write_text("Date,Price\n20-May-87,18.63\n21-May-87,18.45\n22-May-87,18.55\n")
+    return path
+
+
+def test_clean_data_dedups_and_sorts_like_pandas():
+    raw = pd.DataFrame({
+        'date': pd.to_datetime(['2012-07-03', '2012-07-01', '2012-07-02',
+                                '2012-07-01', '2012-07-04', '2012-07-03']),
+        'price': [103.0, 101.0, 102.0, 101.5, 104.0, 103.5],
+    })
+
+    cleaned = clean(raw)
+
+    pd.testing.assert_frame_equal(cleaned, reference_clean(raw))
+    assert cleaned['price'].tolist() == [101.5, 102.0, 103.5, 104.0]
+
+
+def test_clean_data_fills_and_drops_invalid_prices_like_pandas():
+    raw = pd.DataFrame({
+        'date': pd.to_datetime(['2012-07-05', '2012-07-01', '2012-07-02', '2012-07-03',
+                                '2012-07-04', '2012-07-06', '2012-07-07', '2012-07-02',
+                                '2012-07-08']),
+        'price': [0.0, np.nan, np.nan, 103.0, np.nan, -1.0, np.nan, 102.0, np.nan],
+    })
+
+    cleaned = clean(raw)
+
+    pd.testing.assert_frame_equal(cleaned, reference_clean(raw))
+    assert cleaned.index.strftime('%d').tolist() == ['02', '03', '04']
+
+
+def test_load_cached_falls_back_when_stale_and_after_rebuild(raw_csv, tmp_path):
+    processed = tmp_path / "processed"
+    processor = BrentOilData(data_path=raw_csv)
+    processor.load_data()
+    expected = processor.clean_data()
+    processor.save_processed_data(processed)
+
+    cached = BrentOilData(data_path=raw_csv).load_cached(processed)
+    pd.testing.assert_frame_equal(cached, expected, check_freq=False)
+
+    # A raw CSV newer than the cache makes it stale
+    newer = (processed / "brent_clean.parquet").stat().st_mtime + 10
+    os.utime(raw_csv, (newer, newer))
+    assert BrentOilData(data_path=raw_csv).load_cached(processed) is None
+
+    processor.save_processed_data(processed)
+    os.utime(raw_csv, (newer - 20, newer - 20))
+    assert BrentOilData(data_path=raw_csv).load_cached(processed) is not None
+
+
+def test_load_cached_ignores_non_float64_prices(raw_csv, tmp_path):
+    processed = tmp_path / "processed"
+    processed.mkdir()
+    frame = pd.DataFrame({'price': np.array([18.63, 18.45], dtype=np.float32)},
+                         index=pd.date_range('1987-05-20', periods=2, name='date'))
+    frame.to_parquet(processed / "brent_clean.parquet")
+
+    assert BrentOilData(data_path=raw_csv).load_cached(processed) is None
+
+
+def test_load_cached_prefers_memory_mapped_feather(raw_csv, tmp_path):
+    processed = tmp_path / "processed"
+    processor = BrentOilData(data_path=raw_csv)
+    processor.load_data()
+    processor.clean_data()
+    processor.save_processed_data(processed)
+    (processed / "brent_clean.parquet").unlink()
+
+    cached = BrentOilData(data_path=raw_csv).load_cached(processed)
+
+    assert cached['price'].tolist() == [18.63, 18.45, 18.55]
+    # float64 prices are used straight from the memory map, not copied
+    assert not cached['price'].to_numpy().flags.writeable
+    assert BrentOilData(data_path=raw_csv)._with_precision(cached) is cached
+
+    f32 = BrentOilData(data_path=raw_csv, precision='f32').load_cached(processed)
+    assert f32['price'].dtype == np.float32
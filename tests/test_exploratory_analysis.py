@@ -0,0 +1,72 @@
+"""
+Tests for TimeSeriesAnalyzer's cached arrays and memoized analyses.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from exploratory_analysis import TimeSeriesAnalyzer
+
+
+@pytest.fixture
+def prices():
+    """Daily random-walk prices with a few missing values."""
+    rng = np.random.default_rng(3)
+    price = 60.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, 400)))
+    price[[10, 11, 200]] = np.nan
+    dates = pd.date_range('2012-01-02', periods=400)
+    return pd.DataFrame({'date': dates, 'price': price})
+
+
+@pytest.fixture
+def analyzer(prices):
+    return TimeSeriesAnalyzer(prices)
+
+
+def test_price_arrays_are_nan_free_float64(prices):
+    analyzer = TimeSeriesAnalyzer(prices, precision='f32')
+
+    expected = prices['price'].dropna().astype(np.float32).to_numpy(dtype=np.float64)
+    np.testing.assert_array_equal(analyzer._price_arr, expected)
+    assert analyzer._returns_arr.dtype == np.float64
+    assert not np.isnan(analyzer._returns_arr).any()
+    assert analyzer._as_array(None) is analyzer._price_arr
+    assert analyzer._as_array(analyzer.log_returns) is analyzer._returns_arr
+
+    statistics = analyzer.calculate_statistics()
+    assert statistics['price']['mean'] == pytest.approx(expected.mean())
+    assert statistics['price']['std'] == pytest.approx(np.std(expected, ddof=1))
+
+
+def test_cached_calls_share_one_entry_per_arguments(analyzer):
+    first = analyzer.test_stationarity()
+    analyzer.test_stationarity(None, 'both')
+    analyzer.test_stationarity(series=analyzer.price_series)
+    analyzer.test_stationarity(analyzer.price_series, test='both')
+
+    assert len(analyzer._cache) == 1
+    analyzer.test_stationarity(analyzer.log_returns)
+    analyzer.analyze_autocorrelation()
+    analyzer.analyze_autocorrelation(lags=40)
+    assert len(analyzer._cache) == 3
+
+    assert analyzer.test_stationarity()['adf']['statistic'] == first['adf']['statistic']
+
+
+def test_cached_results_are_returned_as_copies(analyzer):
+    statistics = analyzer.calculate_statistics()
+    autocorrelation = analyzer.analyze_autocorrelation(lags=10)
+
+    statistics['price']['mean'] = 0.0
+    autocorrelation['acf_price'][:] = 0.0
+
+    assert analyzer.calculate_statistics()['price']['mean'] != 0.0
+    assert analyzer.analyze_autocorrelation(lags=10)['acf_price'][0] == 1.0
+
+
+def test_other_series_bypass_the_cache(analyzer):
+    other = analyzer.price_series * 2
+
+    assert analyzer.test_stationarity(other, test='adf')['adf'] is not None
+    assert analyzer._cache == {}
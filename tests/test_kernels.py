@@ -0,0 +1,91 @@
+"""
+Tests for the numeric kernels in src/_kernels.py against pandas/statsmodels.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from statsmodels.tsa.stattools import acf, acovf, pacf
+
+from _kernels import (autocovariance_fft, ffill_inplace, pacf_durbin_levinson,
+                      rolling_mean_std_abs, rolling_stats, rolling_stats_parallel)
+
+
+@pytest.fixture
+def prices():
+    """Random-walk price series in the Brent price range."""
+    rng = np.random.default_rng(42)
+    return 60.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, 2000)))
+
+
+@pytest.fixture
+def prices_with_gaps(prices):
+    """Price series with scattered and consecutive missing values."""
+    x = prices.copy()
+    x[[3, 100, 101, 102, 750, 1999]] = np.nan
+    return x
+
+
+@pytest.mark.parametrize("window", [2, 30, 252])
+def test_rolling_mean_std_abs_matches_pandas(prices, window):
+    mean, std, abs_x = rolling_mean_std_abs(prices, window)
+    rolling = pd.Series(prices).rolling(window)
+
+    # pandas' own sliding variance carries ~1e-8 absolute error at these prices
+    np.testing.assert_allclose(mean, rolling.mean().to_numpy(), rtol=1e-10, equal_nan=True)
+    np.testing.assert_allclose(std, rolling.std().to_numpy(), rtol=1e-7, atol=1e-7, equal_nan=True)
+    np.testing.assert_array_equal(abs_x, np.abs(prices))
+
+
+@pytest.mark.parametrize("window", [2, 3, 30])
+def test_rolling_std_matches_two_pass_reference(window):
+    rng = np.random.default_rng(7)
+    x = 60.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, 100_000)))
+    windows = np.lib.stride_tricks.sliding_window_view(x, window)
+    expected = windows.std(axis=1, ddof=1)
+
+    _, std, _ = rolling_mean_std_abs(x, window)
+
+    np.testing.assert_allclose(std[window - 1:], expected, rtol=1e-6)
+    np.testing.assert_allclose(rolling_stats(x, window)[window - 1:, 1], expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize("adjusted", [False, True])
+def test_autocovariance_fft_matches_statsmodels(prices, adjusted):
+    returns = np.diff(np.log(prices))
+    expected = acovf(returns, adjusted=adjusted, fft=False, nlag=40)
+
+    np.testing.assert_allclose(autocovariance_fft(returns, 40, adjusted=adjusted),
+                               expected, rtol=1e-8, atol=1e-15)
+
+
+def test_pacf_durbin_levinson_matches_statsmodels(prices):
+    returns = np.diff(np.log(prices))
+    acov = autocovariance_fft(returns, 40)
+
+    np.testing.assert_allclose(acov / acov[0], acf(returns, nlags=40, fft=True), rtol=1e-8)
+    np.testing.assert_allclose(pacf_durbin_levinson(acov / acov[0]),
+                               pacf(returns, nlags=40, method='ldb'), rtol=1e-8, atol=1e-12)
+
+
+def test_ffill_inplace_matches_pandas(prices_with_gaps):
+    x = np.concatenate([[np.nan, np.nan], prices_with_gaps])
+    expected = pd.Series(x).ffill().to_numpy()
+
+    ffill_inplace(x)
+
+    np.testing.assert_array_equal(x, expected)
+
+
+@pytest.mark.parametrize("kernel", [rolling_stats, rolling_stats_parallel])
+@pytest.mark.parametrize("window", [2, 30])
+def test_rolling_stats_matches_pandas(prices_with_gaps, kernel, window):
+    stats = kernel(prices_with_gaps, window)
+    rolling = pd.Series(prices_with_gaps).rolling(window)
+    expected = np.column_stack([
+        rolling.mean(), rolling.std(), rolling.min(), rolling.max(),
+        rolling.median(), rolling.quantile(0.25), rolling.quantile(0.75),
+    ])
+
+    assert stats.shape == (prices_with_gaps.size, 7)
+    np.testing.assert_allclose(stats, expected, rtol=1e-7, atol=1e-7, equal_nan=True)
@@ -0,0 +1,106 @@
+"""
+Tests for the helpers in src/utils.py against their previous pandas versions.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import utils
+
+
+def reference_nearest_events(change_point_date, events_df, n_events=5):
+    """The pandas nsmallest implementation find_nearest_events replaces."""
+    events_df = events_df.copy()
+    events_df['days_from_change'] = (events_df['event_date'] - change_point_date).dt.days.abs()
+    return events_df.nsmallest(n_events, 'days_from_change').sort_values('event_date')
+
+
+def reference_data_quality(df, date_column='date', price_column='price'):
+    """The pandas implementation check_data_quality replaces."""
+    return {
+        'total_rows': len(df),
+        'date_range': (df[date_column].min(), df[date_column].max()),
+        'missing_dates': df[date_column].isnull().sum(),
+        'missing_prices': df[price_column].isnull().sum(),
+        'zero_prices': (df[price_column] == 0).sum(),
+        'negative_prices': (df[price_column] < 0).sum(),
+        'duplicate_dates': df[date_column].duplicated().sum(),
+        'date_order_violations': (df[date_column].diff().dt.days < 0).sum(),
+        'price_statistics': {
+            'mean': df[price_column].mean(),
+            'median': df[price_column].median(),
+            'std': df[price_column].std(),
+            'min': df[price_column].min(),
+            'max': df[price_column].max(),
+            'q1': df[price_column].quantile(0.25),
+            'q3': df[price_column].quantile(0.75)
+        }
+    }
+
+
+@pytest.fixture
+def events():
+    """Events at symmetric distances around 2014-06-20, with ties and a missing date."""
+    dates = ['2014-06-10', '2014-06-17', '2014-06-23', '2014-06-30', None,
+             '2014-07-15', '2014-05-01', '2014-06-25', '2014-06-15']
+    return pd.DataFrame({
+        'event_date': pd.to_datetime(dates),
+        'event_name': [f'event {i}' for i in range(len(dates))],
+    })
+
+
+@pytest.mark.parametrize("n_events", [0, 1, 2, 3, 4, 5, 8, 20])
+def test_find_nearest_events_matches_nsmallest(events, n_events):
+    change_point = pd.Timestamp('2014-06-20')
+
+    nearest = utils.find_nearest_events(change_point, events, n_events)
+
+    # pandas made every distance float because of the missing date; only a
+    # selected undated event (n_events > dated events) needs floats now
+    pd.testing.assert_frame_equal(nearest, reference_nearest_events(change_point, events, n_events),
+                                  check_dtype=False)
+    if nearest['event_date'].notna().all():
+        assert nearest['days_from_change'].dtype == np.int64
+
+
+def test_check_data_quality_matches_pandas():
+    df = pd.DataFrame({
+        'date': pd.to_datetime(['2012-07-02 00:00', '2012-07-01 00:00', None,
+                                '2012-07-03 00:00', '2012-07-03 00:00', None,
+                                '2012-07-04 12:00', '2012-07-04 00:00']),
+        'price': [101.0, np.nan, 0.0, -2.0, 103.0, 104.0, np.nan, 105.0],
+    })
+
+    report = utils.check_data_quality(df)
+    expected = reference_data_quality(df)
+
+    stats, expected_stats = report.pop('price_statistics'), expected.pop('price_statistics')
+    assert report == expected
+    assert stats == pytest.approx(expected_stats)
+
+
+def test_check_data_quality_without_valid_prices():
+    df = pd.DataFrame({'date': pd.to_datetime(['2012-07-01']), 'price': [np.nan]})
+
+    report = utils.check_data_quality(df)
+
+    assert report['missing_prices'] == 1
+    assert all(np.isnan(value) for value in report['price_statistics'].values())
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_round_trip_writes_nan_as_null(tmp_path, monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(utils, 'orjson', None)
+    elif utils.orjson is None:
+        pytest.skip("orjson is not installed")
+    path = tmp_path / "results.json"
+    data = {'rhat': 1.002, 'ess': [410.0, float('nan')], 'bounds': (float('-inf'), 2),
+            'nested': {'inf': float('inf'), 'mode': np.float64('nan')}}
+
+    utils.save_json(data, path)
+
+    assert utils.load_json(path) == {'rhat': 1.002, 'ess': [410.0, None], 'bounds': [None, 2],
+                                     'nested': {'inf': None, 'mode': None}}
+    assert b'NaN' not in path.read_bytes()